@@ -9,7 +9,7 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from app.database.database import Base
-from app.database.models import TextAnalysis
+from app.database.models import TextAnalysis, Document, ZstdDictionary, SentimentRollup, TermRollup, AnalysisJob, DocumentEmbedding, ApiKey, ApiKeyUsage
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,35 @@
+"""
+add document_embeddings table for similarity search
+
+Revision ID: a9b8c7d6e5f4
+Revises: f1a2b3c4d5e6
+Create Date: 2025-12-01
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9b8c7d6e5f4'
+down_revision = 'f1a2b3c4d5e6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'document_embeddings',
+        sa.Column(
+            'document_hash', sa.String(length=64),
+            sa.ForeignKey('documents.hash', ondelete='CASCADE'), primary_key=True
+        ),
+        sa.Column('encoder', sa.String(length=100), primary_key=True),
+        sa.Column('dim', sa.Integer(), nullable=False),
+        sa.Column('vector', sa.LargeBinary(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()')),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('document_embeddings')
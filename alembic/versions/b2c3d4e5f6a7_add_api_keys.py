@@ -0,0 +1,56 @@
+"""
+add api_keys, api_key_usage and analysis_jobs.api_key_id
+
+Revision ID: b2c3d4e5f6a7
+Revises: a9b8c7d6e5f4
+Create Date: 2025-12-08
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b2c3d4e5f6a7'
+down_revision = 'a9b8c7d6e5f4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'api_keys',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('key_hash', sa.String(length=64), nullable=False, unique=True),
+        sa.Column('key_prefix', sa.String(length=16), nullable=False),
+        sa.Column('weight', sa.Float(), nullable=False, server_default='1'),
+        sa.Column('priority', sa.String(length=16), nullable=False, server_default='interactive'),
+        sa.Column('is_admin', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('active', sa.Boolean(), nullable=False, server_default=sa.true()),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()')),
+        sa.Column('revoked_at', sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_table(
+        'api_key_usage',
+        sa.Column(
+            'api_key_id', sa.Integer(),
+            sa.ForeignKey('api_keys.id', ondelete='CASCADE'), primary_key=True
+        ),
+        sa.Column('day', sa.DateTime(timezone=True), primary_key=True),
+        sa.Column('requests', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('errors', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('llm_calls', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('prompt_tokens', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('completion_tokens', sa.BigInteger(), nullable=False, server_default='0'),
+    )
+    op.add_column(
+        'analysis_jobs',
+        sa.Column('api_key_id', sa.Integer(), sa.ForeignKey('api_keys.id', ondelete='SET NULL'), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('analysis_jobs', 'api_key_id')
+    op.drop_table('api_key_usage')
+    op.drop_table('api_keys')
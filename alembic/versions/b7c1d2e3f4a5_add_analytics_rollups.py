@@ -0,0 +1,75 @@
+"""
+add sentiment/term rollup tables and backfill them from text_analyses
+
+Revision ID: b7c1d2e3f4a5
+Revises: e3a1b2c3d4e5
+Create Date: 2025-11-03
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7c1d2e3f4a5'
+down_revision = 'e3a1b2c3d4e5'
+branch_labels = None
+depends_on = None
+
+BACKFILL_SQL = [
+    """
+    INSERT INTO sentiment_rollups (granularity, bucket_start, sentiment, count)
+    SELECT g.granularity, date_trunc(g.granularity, t.created_at), t.sentiment, count(*)
+    FROM text_analyses t
+    CROSS JOIN (VALUES ('hour'), ('day')) AS g(granularity)
+    WHERE t.created_at IS NOT NULL
+    GROUP BY 1, 2, 3
+    """,
+    """
+    INSERT INTO term_rollups (kind, day, term, count)
+    SELECT 'topic', date_trunc('day', t.created_at), left(trim(e.term), 200), count(DISTINCT t.id)
+    FROM text_analyses t
+    CROSS JOIN LATERAL json_array_elements_text(COALESCE(t.topics::json, '[]'::json)) AS e(term)
+    WHERE t.created_at IS NOT NULL AND trim(e.term) <> ''
+    GROUP BY 1, 2, 3
+    """,
+    """
+    INSERT INTO term_rollups (kind, day, term, count)
+    SELECT 'keyword', date_trunc('day', t.created_at), left(trim(e.term), 200), count(DISTINCT t.id)
+    FROM text_analyses t
+    CROSS JOIN LATERAL json_array_elements_text(COALESCE(t.keywords::json, '[]'::json)) AS e(term)
+    WHERE t.created_at IS NOT NULL AND trim(e.term) <> ''
+    GROUP BY 1, 2, 3
+    """,
+]
+
+
+def upgrade() -> None:
+    op.create_table(
+        'sentiment_rollups',
+        sa.Column('granularity', sa.String(length=8), primary_key=True),
+        sa.Column('bucket_start', sa.DateTime(timezone=True), primary_key=True),
+        sa.Column('sentiment', sa.String(length=20), primary_key=True),
+        sa.Column('count', sa.Integer(), nullable=False, server_default='0'),
+    )
+    op.create_table(
+        'term_rollups',
+        sa.Column('kind', sa.String(length=16), primary_key=True),
+        sa.Column('day', sa.DateTime(timezone=True), primary_key=True),
+        sa.Column('term', sa.String(length=200), primary_key=True),
+        sa.Column('count', sa.Integer(), nullable=False, server_default='0'),
+    )
+    op.create_index(
+        'ix_term_rollups_kind_day_count', 'term_rollups', ['kind', 'day', 'count']
+    )
+
+    # Backfill from existing rows (SQL frozen here; the app's REBUILD_SQL may evolve)
+    if sa.inspect(op.get_bind()).has_table('text_analyses'):
+        for sql in BACKFILL_SQL:
+            op.execute(sql)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_term_rollups_kind_day_count', table_name='term_rollups')
+    op.drop_table('term_rollups')
+    op.drop_table('sentiment_rollups')
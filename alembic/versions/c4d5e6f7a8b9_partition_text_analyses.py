@@ -0,0 +1,110 @@
+"""
+partition text_analyses by month on created_at
+
+Revision ID: c4d5e6f7a8b9
+Revises: b7c1d2e3f4a5
+Create Date: 2025-11-10
+"""
+
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4d5e6f7a8b9'
+down_revision = 'b7c1d2e3f4a5'
+branch_labels = None
+depends_on = None
+
+COLUMNS = (
+    "id, original_text, summary, title, topics, sentiment, keywords, "
+    "processing_time, confidence_score, created_at, updated_at"
+)
+
+
+def upgrade() -> None:
+    from app.database.partitions import add_months, create_partition, is_partitioned, month_start
+
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if not inspector.has_table('text_analyses') or is_partitioned(bind):
+        # Fresh databases get the partitioned table from the model definition
+        return
+
+    # Keep the id sequence alive when the legacy table is dropped
+    op.execute("ALTER SEQUENCE text_analyses_id_seq OWNED BY NONE")
+    op.execute("ALTER TABLE text_analyses RENAME TO text_analyses_legacy")
+    op.execute("ALTER TABLE text_analyses_legacy RENAME CONSTRAINT text_analyses_pkey TO text_analyses_legacy_pkey")
+    op.execute("DROP INDEX IF EXISTS ix_text_analyses_id")
+
+    op.execute(
+        """
+        CREATE TABLE text_analyses (
+            id INTEGER NOT NULL DEFAULT nextval('text_analyses_id_seq'),
+            original_text TEXT NOT NULL,
+            summary TEXT NOT NULL,
+            title VARCHAR(500),
+            topics JSON,
+            sentiment VARCHAR(20) NOT NULL,
+            keywords JSON,
+            processing_time FLOAT NOT NULL,
+            confidence_score FLOAT,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            updated_at TIMESTAMP WITH TIME ZONE,
+            CONSTRAINT text_analyses_pkey PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    op.execute("CREATE INDEX ix_text_analyses_id ON text_analyses (id)")
+
+    # One partition per month from the oldest row through two months ahead
+    oldest = bind.execute(sa.text("SELECT min(created_at) FROM text_analyses_legacy")).scalar()
+    current = month_start(datetime.now(timezone.utc).date())
+    month = month_start(oldest.date()) if oldest else current
+    while month <= add_months(current, 2):
+        create_partition(bind, month)
+        month = add_months(month, 1)
+
+    op.execute(
+        f"""
+        INSERT INTO text_analyses ({COLUMNS})
+        SELECT id, original_text, summary, title, topics, sentiment, keywords,
+               processing_time, confidence_score, COALESCE(created_at, now()), updated_at
+        FROM text_analyses_legacy
+        """
+    )
+    op.execute("DROP TABLE text_analyses_legacy")
+    op.execute("ALTER SEQUENCE text_analyses_id_seq OWNED BY text_analyses.id")
+
+
+def downgrade() -> None:
+    op.execute("ALTER SEQUENCE text_analyses_id_seq OWNED BY NONE")
+    op.execute("ALTER TABLE text_analyses RENAME TO text_analyses_partitioned")
+    op.execute("ALTER TABLE text_analyses_partitioned RENAME CONSTRAINT text_analyses_pkey TO text_analyses_partitioned_pkey")
+    op.execute("DROP INDEX IF EXISTS ix_text_analyses_id")
+
+    op.execute(
+        """
+        CREATE TABLE text_analyses (
+            id INTEGER NOT NULL DEFAULT nextval('text_analyses_id_seq'),
+            original_text TEXT NOT NULL,
+            summary TEXT NOT NULL,
+            title VARCHAR(500),
+            topics JSON,
+            sentiment VARCHAR(20) NOT NULL,
+            keywords JSON,
+            processing_time FLOAT NOT NULL,
+            confidence_score FLOAT,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+            updated_at TIMESTAMP WITH TIME ZONE,
+            CONSTRAINT text_analyses_pkey PRIMARY KEY (id)
+        )
+        """
+    )
+    op.execute("CREATE INDEX ix_text_analyses_id ON text_analyses (id)")
+    op.execute(f"INSERT INTO text_analyses ({COLUMNS}) SELECT {COLUMNS} FROM text_analyses_partitioned")
+    # Dropping the parent drops every attached partition
+    op.execute("DROP TABLE text_analyses_partitioned")
+    op.execute("ALTER SEQUENCE text_analyses_id_seq OWNED BY text_analyses.id")
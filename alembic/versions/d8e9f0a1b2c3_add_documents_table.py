@@ -0,0 +1,125 @@
+"""
+store original_text once per distinct text in a zstd-compressed documents table
+
+Revision ID: d8e9f0a1b2c3
+Revises: c4d5e6f7a8b9
+Create Date: 2025-11-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8e9f0a1b2c3'
+down_revision = 'c4d5e6f7a8b9'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+
+def upgrade() -> None:
+    op.create_table(
+        'zstd_dictionaries',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column('data', sa.LargeBinary(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()')),
+    )
+    op.create_table(
+        'documents',
+        sa.Column('hash', sa.String(length=64), primary_key=True),
+        sa.Column('content', sa.LargeBinary(), nullable=False),
+        sa.Column('dict_id', sa.Integer(), sa.ForeignKey('zstd_dictionaries.id'), nullable=True),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()')),
+    )
+    op.create_index(
+        'ix_documents_search_vector', 'documents', ['search_vector'], postgresql_using='gin'
+    )
+
+    bind = op.get_bind()
+    columns = {c['name'] for c in sa.inspect(bind).get_columns('text_analyses')}
+    if 'original_text' not in columns:
+        # Fresh database created from the current models
+        return
+
+    op.add_column('text_analyses', sa.Column('document_hash', sa.String(length=64), nullable=True))
+    _backfill(bind)
+
+    op.alter_column('text_analyses', 'document_hash', nullable=False)
+    op.create_index('ix_text_analyses_document_hash', 'text_analyses', ['document_hash'])
+    op.create_foreign_key(
+        'text_analyses_document_hash_fkey', 'text_analyses', 'documents', ['document_hash'], ['hash']
+    )
+    op.drop_column('text_analyses', 'original_text')
+
+
+def _backfill(bind) -> None:
+    """Compress each distinct text in Python (zstd is not available in SQL)"""
+    from app.services.documents import document_store, hash_text
+
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.text(
+                "SELECT id, original_text FROM text_analyses "
+                "WHERE id > :last_id ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BATCH_SIZE},
+        ).all()
+        if not rows:
+            break
+
+        by_hash = {}
+        updates = []
+        for row_id, original_text in rows:
+            digest = hash_text(original_text)
+            by_hash.setdefault(digest, original_text)
+            updates.append({"row_id": row_id, "digest": digest})
+
+        bind.execute(
+            sa.text(
+                "INSERT INTO documents (hash, content, size, search_vector) "
+                "VALUES (:hash, :content, :size, to_tsvector('simple', :text)) "
+                "ON CONFLICT (hash) DO NOTHING"
+            ),
+            [
+                {"hash": digest, "content": document_store.compress(value)[0], "size": len(value), "text": value}
+                for digest, value in by_hash.items()
+            ],
+        )
+        bind.execute(
+            sa.text("UPDATE text_analyses SET document_hash = :digest WHERE id = :row_id"),
+            updates,
+        )
+        last_id = rows[-1][0]
+
+
+def downgrade() -> None:
+    import zstandard
+
+    bind = op.get_bind()
+    op.add_column('text_analyses', sa.Column('original_text', sa.Text(), nullable=True))
+
+    dictionaries = {
+        r.id: zstandard.ZstdCompressionDict(r.data)
+        for r in bind.execute(sa.text("SELECT id, data FROM zstd_dictionaries")).all()
+    }
+    for doc in bind.execute(sa.text("SELECT hash, content, dict_id FROM documents")).all():
+        params = {"dict_data": dictionaries[doc.dict_id]} if doc.dict_id is not None else {}
+        value = zstandard.ZstdDecompressor(**params).decompress(doc.content).decode("utf-8")
+        bind.execute(
+            sa.text("UPDATE text_analyses SET original_text = :value WHERE document_hash = :hash"),
+            {"value": value, "hash": doc.hash},
+        )
+
+    op.alter_column('text_analyses', 'original_text', nullable=False)
+    op.drop_constraint('text_analyses_document_hash_fkey', 'text_analyses', type_='foreignkey')
+    op.drop_index('ix_text_analyses_document_hash', table_name='text_analyses')
+    op.drop_column('text_analyses', 'document_hash')
+    op.drop_index('ix_documents_search_vector', table_name='documents')
+    op.drop_table('documents')
+    op.drop_table('zstd_dictionaries')
@@ -0,0 +1,50 @@
+"""
+add analysis_jobs queue table
+
+Revision ID: f1a2b3c4d5e6
+Revises: d8e9f0a1b2c3
+Create Date: 2025-11-24
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1a2b3c4d5e6'
+down_revision = 'd8e9f0a1b2c3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'analysis_jobs',
+        sa.Column('id', sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column('status', sa.String(length=16), nullable=False, server_default='queued'),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('result', sa.JSON(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('webhook_url', sa.String(length=2000), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('max_attempts', sa.Integer(), nullable=False, server_default='3'),
+        sa.Column('locked_by', sa.String(length=100), nullable=True),
+        sa.Column('run_after', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()')),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(
+        'ix_analysis_jobs_queued', 'analysis_jobs', ['run_after', 'id'],
+        postgresql_where=sa.text("status = 'queued'"),
+    )
+    op.create_index(
+        'ix_analysis_jobs_running', 'analysis_jobs', ['started_at'],
+        postgresql_where=sa.text("status = 'running'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_analysis_jobs_running', table_name='analysis_jobs')
+    op.drop_index('ix_analysis_jobs_queued', table_name='analysis_jobs')
+    op.drop_table('analysis_jobs')
@@ -0,0 +1,47 @@
+"""
+API key authentication dependencies
+"""
+
+from typing import Optional
+
+from fastapi import Depends, Header, HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.database.database import get_db
+from app.lib.tenancy import ANONYMOUS, Tenant
+from app.services import api_keys
+
+
+def _bearer(authorization: Optional[str]) -> Optional[str]:
+    if authorization and authorization.lower().startswith("bearer "):
+        return authorization[7:].strip() or None
+    return None
+
+
+def get_tenant(
+    x_api_key: Optional[str] = Header(None),
+    authorization: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+) -> Tenant:
+    """
+    Resolve the caller from X-API-Key or Authorization: Bearer. Without a
+    key the caller is anonymous, unless API_KEYS_REQUIRED is set.
+    """
+    raw = x_api_key or _bearer(authorization)
+    if not raw:
+        if settings.API_KEYS_REQUIRED:
+            raise HTTPException(status_code=401, detail="API key required", headers={"WWW-Authenticate": "Bearer"})
+        return ANONYMOUS
+
+    tenant = api_keys.authenticate(db, raw)
+    if tenant is None:
+        raise HTTPException(status_code=401, detail="Invalid API key", headers={"WWW-Authenticate": "Bearer"})
+    return tenant
+
+
+def require_admin(tenant: Tenant = Depends(get_tenant)) -> Tenant:
+    """Admin endpoints always need an admin key, even when keys are optional"""
+    if not tenant.is_admin:
+        raise HTTPException(status_code=403, detail="Admin API key required")
+    return tenant
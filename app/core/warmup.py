@@ -0,0 +1,132 @@
+"""
+Startup warm-up and idle keep-alive for upstream connections and NLP models
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.database.database import engine
+from app.lib.keyword_extractor import keyword_extractor
+from app.lib.llm_client import llm_client
+from app.models.schemas import TextAnalysisRequest, LLMAnalysisResponse
+from app.services.text_analyzer import text_analyzer_service
+
+logger = logging.getLogger("warmup")
+
+SYNTHETIC_TEXT = (
+    "Artificial intelligence is changing how teams work. Many people worry about "
+    "privacy, while others see clear benefits in productivity and assistance."
+)
+
+
+def warm_nlp() -> None:
+    """Load the POS tagger and run the local (non-LLM) analysis path once"""
+    keyword_extractor.warm_up()
+    request = TextAnalysisRequest(text=SYNTHETIC_TEXT)
+    analysis = LLMAnalysisResponse.model_validate(
+        llm_client._parse_json(
+            '{"title": "Warm-up", "summary": "Synthetic.", "sentiment": "neutral", '
+            '"topics": ["ai", "work", "privacy"]}'
+        )
+    )
+    keywords = keyword_extractor.extract_keywords(request.text)
+    text_analyzer_service.assemble_batch([request], [analysis], [keywords], [0.0])[0].model_dump()
+
+
+def warm_db(connections: int) -> None:
+    """Open `connections` pooled DB connections so the first requests find them ready"""
+    checked_out = []
+    try:
+        for _ in range(connections):
+            conn = engine.connect()
+            conn.execute(text("SELECT 1"))
+            checked_out.append(conn)
+    finally:
+        # Returning them to the pool keeps them open for reuse
+        for conn in checked_out:
+            conn.close()
+
+
+async def ping_upstreams(connections: int) -> None:
+    """
+    Issue `connections` concurrent lightweight requests per provider so the
+    HTTP pool holds that many established (TLS) connections.
+    """
+    async def ping(provider) -> None:
+        try:
+            await provider.client.models.list()
+        except Exception:
+            # Some OpenAI-compatible endpoints have no /models; the connection is still warm
+            pass
+
+    await asyncio.gather(
+        *(ping(p) for p in llm_client.pool.providers for _ in range(max(connections, 0)))
+    )
+
+
+async def warm_up() -> Dict[str, Any]:
+    """Run every warm-up step; failures are logged, never fatal"""
+    timings: Dict[str, Any] = {}
+
+    async def step(name: str, coro) -> None:
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(coro, timeout=settings.WARMUP_TIMEOUT)
+            timings[name] = round((time.perf_counter() - start) * 1000, 2)
+        except Exception as e:
+            timings[name] = f"failed: {e}"
+            logger.warning("Warm-up step %s failed: %s", name, e)
+
+    await asyncio.gather(
+        step("nlp_ms", asyncio.to_thread(warm_nlp)),
+        step("db_ms", asyncio.to_thread(warm_db, settings.WARMUP_DB_CONNECTIONS)),
+        step("upstream_ms", ping_upstreams(settings.WARMUP_UPSTREAM_CONNECTIONS)),
+    )
+    logger.info("Warm-up finished: %s", timings)
+    return timings
+
+
+async def keep_alive(stop: asyncio.Event) -> None:
+    """Periodically touch idle DB and upstream connections so they are not dropped"""
+    while not stop.is_set():
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=settings.KEEPALIVE_PING_INTERVAL)
+            return
+        except asyncio.TimeoutError:
+            pass
+        try:
+            await asyncio.to_thread(warm_db, 1)
+            await ping_upstreams(1)
+        except Exception as e:
+            logger.warning("Keep-alive ping failed: %s", e)
+
+
+class WarmupManager:
+    """Owns the warm-up result and the keep-alive task for the app lifespan"""
+
+    def __init__(self) -> None:
+        self.timings: Optional[Dict[str, Any]] = None
+        self._stop = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if settings.WARMUP_ENABLED:
+            self.timings = await warm_up()
+        if settings.KEEPALIVE_PING_INTERVAL > 0:
+            self._stop = asyncio.Event()
+            self._task = asyncio.create_task(keep_alive(self._stop))
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+
+# Global instance
+warmup_manager = WarmupManager()
@@ -0,0 +1,23 @@
+"""
+Uvicorn worker class for gunicorn with explicit event loop / HTTP parser selection
+"""
+
+import importlib.util
+
+from uvicorn.workers import UvicornWorker
+
+
+def _has_module(name: str) -> bool:
+    return importlib.util.find_spec(name) is not None
+
+
+class TunedUvicornWorker(UvicornWorker):
+    """UvicornWorker that pins uvloop + httptools when available"""
+
+    CONFIG_KWARGS = {
+        **UvicornWorker.CONFIG_KWARGS,
+        "loop": "uvloop" if _has_module("uvloop") else "asyncio",
+        "http": "httptools" if _has_module("httptools") else "h11",
+        "proxy_headers": True,
+        "server_header": False,
+    }
@@ -2,18 +2,25 @@
 Database models for text analysis
 """
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, Float, JSON
+from sqlalchemy import Column, Integer, BigInteger, Boolean, String, Text, DateTime, Float, JSON, Index, ForeignKey, LargeBinary
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database.database import Base
 
 
 class TextAnalysis(Base):
-    """Model for storing text analysis results"""
+    """Model for storing text analysis results
+    
+    Range-partitioned by month on created_at (see app/database/partitions.py),
+    so created_at is part of the primary key.
+    """
     
     __tablename__ = "text_analyses"
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
     
-    id = Column(Integer, primary_key=True, index=True)
-    original_text = Column(Text, nullable=False)
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    document_hash = Column(String(64), ForeignKey("documents.hash"), nullable=False, index=True)
     summary = Column(Text, nullable=False)
     title = Column(String(500), nullable=True)
     topics = Column(JSON, nullable=True)  # Store as JSON array
@@ -21,8 +28,159 @@ class TextAnalysis(Base):
     keywords = Column(JSON, nullable=True)  # Store as JSON array
     processing_time = Column(Float, nullable=False)
     confidence_score = Column(Float, nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), primary_key=True, server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    document = relationship("Document", lazy="noload")
+    
     def __repr__(self):
         return f"<TextAnalysis(id={self.id}, title='{self.title}')>"
+
+
+class Document(Base):
+    """Distinct analyzed text, stored once and zstd-compressed, keyed by SHA-256"""
+    
+    __tablename__ = "documents"
+    
+    hash = Column(String(64), primary_key=True)
+    content = Column(LargeBinary, nullable=False)  # zstd frame
+    dict_id = Column(Integer, ForeignKey("zstd_dictionaries.id"), nullable=True)
+    size = Column(Integer, nullable=False)  # uncompressed length in characters
+    search_vector = Column(TSVECTOR, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    __table_args__ = (
+        Index("ix_documents_search_vector", "search_vector", postgresql_using="gin"),
+    )
+    
+    def __repr__(self):
+        return f"<Document(hash='{self.hash[:12]}', size={self.size})>"
+
+
+class DocumentEmbedding(Base):
+    """Embedding vector of a document for one encoder (float32 bytes)"""
+    
+    __tablename__ = "document_embeddings"
+    
+    document_hash = Column(String(64), ForeignKey("documents.hash", ondelete="CASCADE"), primary_key=True)
+    encoder = Column(String(100), primary_key=True)
+    dim = Column(Integer, nullable=False)
+    vector = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class ZstdDictionary(Base):
+    """Trained zstd dictionary used to compress documents"""
+    
+    __tablename__ = "zstd_dictionaries"
+    
+    id = Column(Integer, primary_key=True, autoincrement=False)  # zstd dict id
+    data = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class SentimentRollup(Base):
+    """Pre-aggregated sentiment counts per hour/day bucket"""
+    
+    __tablename__ = "sentiment_rollups"
+    
+    granularity = Column(String(8), primary_key=True)  # "hour" | "day"
+    bucket_start = Column(DateTime(timezone=True), primary_key=True)
+    sentiment = Column(String(20), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<SentimentRollup({self.granularity} {self.bucket_start} {self.sentiment}={self.count})>"
+
+
+class TermRollup(Base):
+    """Pre-aggregated daily topic/keyword frequencies"""
+    
+    __tablename__ = "term_rollups"
+    
+    kind = Column(String(16), primary_key=True)  # "topic" | "keyword"
+    day = Column(DateTime(timezone=True), primary_key=True)
+    term = Column(String(200), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    
+    __table_args__ = (
+        Index("ix_term_rollups_kind_day_count", "kind", "day", "count"),
+    )
+    
+    def __repr__(self):
+        return f"<TermRollup({self.kind} {self.day} {self.term}={self.count})>"
+
+
+class AnalysisJob(Base):
+    """Queued /api/analyze request processed by background workers"""
+    
+    __tablename__ = "analysis_jobs"
+    
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    status = Column(String(16), nullable=False, default="queued")  # queued|running|succeeded|failed
+    payload = Column(JSON, nullable=False)  # TextAnalysisRequest fields
+    result = Column(JSON, nullable=True)  # TextAnalysisResponse on success
+    error = Column(Text, nullable=True)
+    webhook_url = Column(String(2000), nullable=True)
+    api_key_id = Column(Integer, ForeignKey("api_keys.id", ondelete="SET NULL"), nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    locked_by = Column(String(100), nullable=True)
+    run_after = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    
+    __table_args__ = (
+        Index(
+            "ix_analysis_jobs_queued",
+            "run_after",
+            "id",
+            postgresql_where=(status == "queued"),
+        ),
+        Index(
+            "ix_analysis_jobs_running",
+            "started_at",
+            postgresql_where=(status == "running"),
+        ),
+    )
+    
+    def __repr__(self):
+        return f"<AnalysisJob(id={self.id}, status='{self.status}')>"
+
+
+class ApiKey(Base):
+    """Tenant API key; only the SHA-256 of the key is stored"""
+    
+    __tablename__ = "api_keys"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String(100), nullable=False)
+    key_hash = Column(String(64), nullable=False, unique=True)
+    key_prefix = Column(String(16), nullable=False)  # shown in listings to tell keys apart
+    weight = Column(Float, nullable=False, default=1.0)  # fair-share weight in the LLM scheduler
+    priority = Column(String(16), nullable=False, default="interactive")  # interactive|bulk
+    is_admin = Column(Boolean, nullable=False, default=False)
+    active = Column(Boolean, nullable=False, default=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    revoked_at = Column(DateTime(timezone=True), nullable=True)
+    
+    def __repr__(self):
+        return f"<ApiKey(id={self.id}, name='{self.name}', prefix='{self.key_prefix}')>"
+
+
+class ApiKeyUsage(Base):
+    """Per-key, per-day request and LLM token counters"""
+    
+    __tablename__ = "api_key_usage"
+    
+    api_key_id = Column(Integer, ForeignKey("api_keys.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(DateTime(timezone=True), primary_key=True)
+    requests = Column(BigInteger, nullable=False, default=0)
+    errors = Column(BigInteger, nullable=False, default=0)
+    llm_calls = Column(BigInteger, nullable=False, default=0)
+    prompt_tokens = Column(BigInteger, nullable=False, default=0)
+    completion_tokens = Column(BigInteger, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<ApiKeyUsage(api_key_id={self.api_key_id}, day={self.day})>"
@@ -0,0 +1,192 @@
+"""
+Monthly range partitions for text_analyses: creation and retention
+
+A DEFAULT partition catches rows for months that have no partition yet;
+ensure_partitions moves them into proper partitions and logs a warning.
+"""
+
+import logging
+from datetime import date, datetime, timezone
+from typing import List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.config import settings
+
+PARENT_TABLE = "text_analyses"
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+
+logger = logging.getLogger("partitions")
+
+
+def month_start(d: date) -> date:
+    return date(d.year, d.month, 1)
+
+
+def add_months(d: date, months: int) -> date:
+    index = d.year * 12 + (d.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_p{month.year:04d}_{month.month:02d}"
+
+
+def is_partitioned(conn: Connection) -> bool:
+    """True once the partitioning migration has run"""
+    return bool(
+        conn.execute(
+            text(
+                "SELECT 1 FROM pg_partitioned_table p "
+                "JOIN pg_class c ON c.oid = p.partrelid "
+                "WHERE c.relname = :name AND c.relnamespace = 'public'::regnamespace"
+            ),
+            {"name": PARENT_TABLE},
+        ).scalar()
+    )
+
+
+def _table_exists(conn: Connection, name: str) -> bool:
+    return conn.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": f'public."{name}"'}).scalar()
+
+
+def create_default_partition(conn: Connection) -> None:
+    """Catch-all partition so inserts never fail when a month is missing"""
+    conn.execute(text(f'CREATE TABLE IF NOT EXISTS "{DEFAULT_PARTITION}" PARTITION OF {PARENT_TABLE} DEFAULT'))
+
+
+def create_partition(conn: Connection, month: date) -> str:
+    """
+    Create the partition covering `month` if it does not exist yet.
+    Rows that already landed in the default partition for that month are
+    moved into it (Postgres refuses the new partition while they are there).
+    """
+    name = partition_name(month)
+    if _table_exists(conn, name):
+        return name
+    lower, upper = month.isoformat(), add_months(month, 1).isoformat()
+    stray = _table_exists(conn, DEFAULT_PARTITION)
+    if stray:
+        conn.execute(
+            text(
+                f'CREATE TEMP TABLE "{name}_stray" ON COMMIT DROP AS '
+                f'WITH moved AS (DELETE FROM "{DEFAULT_PARTITION}" '
+                f"WHERE created_at >= '{lower}' AND created_at < '{upper}' RETURNING *) "
+                f"SELECT * FROM moved"
+            )
+        )
+    conn.execute(
+        text(
+            f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF {PARENT_TABLE} '
+            f"FOR VALUES FROM ('{lower}') TO ('{upper}')"
+        )
+    )
+    if stray:
+        moved = conn.execute(text(f'INSERT INTO {PARENT_TABLE} SELECT * FROM "{name}_stray"')).rowcount
+        conn.execute(text(f'DROP TABLE "{name}_stray"'))
+        if moved:
+            logger.warning("Moved %d rows from %s into new partition %s", moved, DEFAULT_PARTITION, name)
+    return name
+
+
+def list_partitions(conn: Connection) -> List[Tuple[str, date]]:
+    """(name, month) for each attached monthly partition, oldest first"""
+    rows = conn.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :name"
+        ),
+        {"name": PARENT_TABLE},
+    ).scalars()
+
+    prefix = f"{PARENT_TABLE}_p"
+    partitions = []
+    for name in rows:
+        if not name.startswith(prefix):
+            continue
+        try:
+            year, month = name[len(prefix):].split("_")
+            partitions.append((name, date(int(year), int(month), 1)))
+        except ValueError:
+            continue
+    return sorted(partitions, key=lambda p: p[1])
+
+
+def ensure_partitions(engine: Engine, months_ahead: Optional[int] = None, today: Optional[date] = None) -> List[str]:
+    """Create partitions for the current month and `months_ahead` future months"""
+    months_ahead = settings.PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    current = month_start(today or datetime.now(timezone.utc).date())
+    created: List[str] = []
+    with engine.begin() as conn:
+        if not is_partitioned(conn):
+            return created
+        create_default_partition(conn)
+        for i in range(months_ahead + 1):
+            created.append(create_partition(conn, add_months(current, i)))
+
+        # Rows in the default partition mean a month was missing when they
+        # were written (maintenance not run, clock skew); give them their own
+        stray_months = conn.execute(
+            text(f"SELECT DISTINCT date_trunc('month', created_at)::date FROM \"{DEFAULT_PARTITION}\"")
+        ).scalars().all()
+        if stray_months:
+            logger.warning("%s holds rows for %s; creating their partitions", DEFAULT_PARTITION, stray_months)
+        for month in sorted(stray_months):
+            created.append(create_partition(conn, month))
+    return created
+
+
+def expired_partitions(conn: Connection, retention_months: int, today: Optional[date] = None) -> List[Tuple[str, date]]:
+    """Partitions whose whole month is older than the retention window"""
+    if retention_months <= 0:
+        return []
+    cutoff = add_months(month_start(today or datetime.now(timezone.utc).date()), -retention_months)
+    return [(name, month) for name, month in list_partitions(conn) if month < cutoff]
+
+
+def apply_retention(engine: Engine, retention_months: Optional[int] = None, today: Optional[date] = None) -> List[str]:
+    """
+    Archive partitions older than the retention window to compressed files,
+    then detach and drop them. Returns the archived file paths.
+    """
+    from app.services.archive import archive_partition
+
+    retention_months = settings.RETENTION_MONTHS if retention_months is None else retention_months
+    archived: List[str] = []
+    with engine.connect() as conn:
+        if not is_partitioned(conn):
+            return archived
+        expired = expired_partitions(conn, retention_months, today)
+
+    for name, month in expired:
+        # Export first; only drop once the archive file is complete on disk
+        with engine.connect() as conn:
+            path = archive_partition(conn, name, month)
+        with engine.begin() as conn:
+            conn.execute(text(f'ALTER TABLE {PARENT_TABLE} DETACH PARTITION "{name}"'))
+            conn.execute(text(f'DROP TABLE "{name}"'))
+        archived.append(str(path))
+
+    if archived:
+        # Texts only referenced by the dropped partitions are now unreachable
+        from app.database.database import SessionLocal
+        from app.services.documents import garbage_collect
+
+        session = SessionLocal()
+        try:
+            garbage_collect(session)
+        finally:
+            session.close()
+    return archived
+
+
+if __name__ == "__main__":
+    # Maintenance entry point, e.g. from a daily cron:
+    #   python -m app.database.partitions
+    from app.database.database import engine
+
+    print("Ensured partitions:", ", ".join(ensure_partitions(engine)) or "none")
+    print("Archived:", ", ".join(apply_retention(engine)) or "none")
@@ -0,0 +1,86 @@
+"""
+Pluggable text encoders for semantic search (local hashing or OpenAI-compatible API)
+"""
+
+import re
+import zlib
+from typing import List
+
+import numpy as np
+
+from app.core.config import settings
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+class TextEncoder:
+    """Maps texts to L2-normalized float32 vectors of a fixed dimension"""
+
+    name: str = "base"
+    dim: int = 0
+
+    async def encode(self, texts: List[str]) -> np.ndarray:
+        raise NotImplementedError
+
+    @staticmethod
+    def _normalize(matrix: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (matrix / norms).astype(np.float32, copy=False)
+
+
+class HashingEncoder(TextEncoder):
+    """
+    Offline hashing vectorizer: unigrams + bigrams hashed into `dim` buckets
+    with a signed hash and sublinear term frequency. No model, no network.
+    """
+
+    def __init__(self, dim: int) -> None:
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    async def encode(self, texts: List[str]) -> np.ndarray:
+        return self.encode_sync(texts)
+
+    def encode_sync(self, texts: List[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, value in enumerate(texts):
+            tokens = _TOKEN_RE.findall((value or "").lower())
+            features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+            if not features:
+                continue
+            hashes = np.fromiter((zlib.crc32(f.encode("utf-8")) for f in features), dtype=np.uint32, count=len(features))
+            buckets = (hashes % self.dim).astype(np.intp)
+            signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+            np.add.at(matrix[row], buckets, signs)
+        matrix = np.sign(matrix) * np.log1p(np.abs(matrix))
+        return self._normalize(matrix)
+
+
+class OpenAIEncoder(TextEncoder):
+    """Embeddings endpoint of the first configured LLM provider"""
+
+    def __init__(self, model: str, dim: int) -> None:
+        self.model = model
+        self.dim = dim
+        self.name = f"openai-{model}-{dim}"
+
+    async def encode(self, texts: List[str]) -> np.ndarray:
+        from app.lib.llm_client import llm_client
+
+        if not llm_client.pool.providers:
+            raise RuntimeError("OPENAI_API_KEY is not configured")
+        provider = llm_client.pool.providers[0]
+        resp = await provider.client.embeddings.create(model=self.model, input=texts, dimensions=self.dim)
+        matrix = np.array([d.embedding for d in sorted(resp.data, key=lambda d: d.index)], dtype=np.float32)
+        return self._normalize(matrix)
+
+
+def get_encoder() -> TextEncoder:
+    if settings.EMBEDDING_ENCODER == "openai":
+        return OpenAIEncoder(settings.EMBEDDING_MODEL, settings.EMBEDDING_DIM)
+    return HashingEncoder(settings.EMBEDDING_DIM)
+
+
+# Global instance
+text_encoder = get_encoder()
@@ -4,13 +4,41 @@ Lightweight keyword extractor (prefers nouns) with NLTK fallback
 
 import re
 from collections import Counter
-from typing import List
+from typing import Any, List, Optional
+
+from app.core.config import settings
 
 
 class KeywordExtractor:
     def __init__(self) -> None:
         self._nltk_ready = self._ensure_nltk()
         self._stopwords = self._load_stopwords()
+        # nltk.pos_tag builds a new PerceptronTagger on every call; keep one
+        self._tagger: Optional[Any] = None
+
+    def warm_up(self) -> None:
+        """
+        Load the tagger model and punkt now instead of on the first request.
+        Called in the gunicorn master (NLP_SHARED_MODE preload/mmap) so
+        workers inherit the loaded models, and again in each worker, where
+        it is a no-op if the master already did it.
+        """
+        if self._nltk_ready and self._tagger is None:
+            try:
+                self._tagger = self._load_tagger(settings.NLP_SHARED_MODE)
+            except Exception:
+                self._tagger = None
+        self.extract_keywords("Warm-up sentence about keyword extraction and tagging.")
+
+    @staticmethod
+    def _load_tagger(mode: str) -> Any:
+        if mode == "mmap":
+            from app.lib.mmap_tagger import MmapPerceptronTagger
+
+            return MmapPerceptronTagger.load_or_export(settings.NLP_MMAP_DIR)
+        from nltk.tag import PerceptronTagger
+
+        return PerceptronTagger()
 
     def extract_keywords(self, text: str, top_k: int = 3) -> List[str]:
         if not text:
@@ -21,7 +49,7 @@ class KeywordExtractor:
             try:
                 import nltk
 
-                tagged = nltk.pos_tag(tokens)
+                tagged = self._tagger.tag(tokens) if self._tagger is not None else nltk.pos_tag(tokens)
                 candidates = [w.lower() for w, t in tagged if t.startswith("NN")]
             except Exception:
                 candidates = [t.lower() for t in tokens]
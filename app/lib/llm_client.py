@@ -2,83 +2,54 @@
 LLM client wrapper used by TextAnalyzerService
 """
 
-import os
-import json
 import time
 import re
-from typing import Any, Dict
+import asyncio
+from collections import deque
+from contextlib import suppress
+from typing import Any, Deque, Dict, Optional
 
-from openai import AsyncOpenAI
+import orjson
+from openai import BadRequestError
 
 from app.core.config import settings
-from app.prompts.prompts import COMPREHENSIVE_ANALYSIS_PROMPT
+from app.lib.fair_scheduler import FairScheduler
+from app.lib.llm_router import LLMProvider, ProviderPool
+from app.lib.profiling import add_stage, stage
+from app.lib.tenancy import current_tenant, record_llm_usage
+from app.prompts.prompts import ANALYSIS_JSON_SCHEMA
+from app.prompts.registry import prompt_registry
 from app.models.schemas import LLMAnalysisResponse
 from app.utils.logger import log_llm_request
 
 
 class LLMClient:
     def __init__(self) -> None:
-        api_key = (
-            settings.OPENAI_API_KEY
-            or os.getenv("OPENAI_API_KEY")
-            or os.getenv("GEMINI_API_KEY")
-            or ""
-        )
-        base_url = os.getenv("OPENAI_BASE_URL") or os.getenv("GEMINI_BASE_URL")
-        self.client = AsyncOpenAI(api_key=api_key, base_url=base_url) if api_key else None
-        self.model = (
-            settings.OPENAI_MODEL
-            or os.getenv("OPENAI_MODEL")
-            or os.getenv("GEMINI_MODEL")
-            or "gpt-4o-2024-08-06"
-        )
+        self.pool = ProviderPool.from_settings()
+        # Orders concurrent analyses across tenants (interactive before bulk)
+        self.scheduler = FairScheduler(settings.LLM_MAX_CONCURRENCY)
+        # Recent successful call latencies (seconds), used to derive the hedge delay
+        self._latencies: Deque[float] = deque(maxlen=500)
+        self._calls = 0
+        self._hedges = 0
 
     async def analyze_text_comprehensive(self, text: str) -> LLMAnalysisResponse:
-        if not self.client:
+        if not self.pool.providers:
             raise RuntimeError("OPENAI_API_KEY is not configured")
 
-        prompt = COMPREHENSIVE_ANALYSIS_PROMPT.format(
-            text=text[: settings.MAX_TEXT_LENGTH]
-        )
+        text_length = len(text)
+        text = text[: settings.MAX_TEXT_LENGTH]
 
         start = time.perf_counter()
         content: str
+        tenant = current_tenant.get()
 
         try:
-            # Prefer JSON mode for stricter structure; fall back if unsupported
-            try:
-                resp = await self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": (
-                                "Return only a strict JSON object with keys: "
-                                "title, summary, sentiment, topics (exactly 3 items)."
-                            ),
-                        },
-                        {"role": "user", "content": prompt},
-                    ],
-                    temperature=0,
-                    response_format={"type": "json_object"},
-                )
-            except Exception:
-                resp = await self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": (
-                                "Respond with a JSON object only. Keys: title, summary, "
-                                "sentiment (positive|neutral|negative), topics (3 strings)."
-                            ),
-                        },
-                        {"role": "user", "content": prompt},
-                    ],
-                    temperature=0,
-                )
-
-            content = (resp.choices[0].message.content or "").strip()
+            async with self.scheduler.slot(tenant.key_id, tenant.weight, len(text), tenant.priority):
+                add_stage("llm_queue", time.perf_counter() - start)
+                with stage("llm_call"):
+                    content = await self._hedged_complete(text, text_length)
+            parse_start = time.perf_counter()
             data = self._parse_json(content)
 
             topics = data.get("topics") or []
@@ -103,22 +74,160 @@ class LLMClient:
                 }
             )
 
-            log_llm_request("comprehensive", len(text), time.perf_counter() - start)
+            add_stage("llm_parse", time.perf_counter() - parse_start)
+            log_llm_request("comprehensive", text_length, time.perf_counter() - start)
             return result
         except Exception as e:
             raise RuntimeError(f"LLM analysis failed: {e}")
 
+    async def _complete(self, text: str, provider: LLMProvider) -> str:
+        """
+        Run a single chat completion and return the raw message content.
+        Tries the provider's structured-output modes best first; a mode the
+        endpoint rejects as a bad request is not tried again.
+        """
+        modes = provider.output_modes()
+        for i, mode in enumerate(modes):
+            template = prompt_registry.select("comprehensive", len(text), mode)
+            kwargs: Dict[str, Any] = {}
+            if mode == "json_schema":
+                kwargs["response_format"] = {"type": "json_schema", "json_schema": ANALYSIS_JSON_SCHEMA}
+            elif mode == "json_object":
+                kwargs["response_format"] = {"type": "json_object"}
+            if provider.prompt_cache_key:
+                # Routes calls sharing this template's prefix to the same cache
+                kwargs["prompt_cache_key"] = template.id
+            try:
+                resp = await provider.client.chat.completions.create(
+                    model=provider.model,
+                    messages=template.render(text),
+                    temperature=0,
+                    **kwargs,
+                )
+            except BadRequestError:
+                if i == len(modes) - 1:
+                    raise
+                provider.unsupported_modes.add(mode)
+                continue
+            except Exception:
+                if i == len(modes) - 1:
+                    raise
+                continue
+            usage = getattr(resp, "usage", None)
+            record_llm_usage(usage)
+            prompt_registry.record_usage(template.id, usage)
+            return (resp.choices[0].message.content or "").strip()
+        raise RuntimeError("No output mode available")
+
+    async def _routed_complete(self, text: str, text_length: int = 0) -> str:
+        """Try providers in routing order, failing over to the next on error"""
+        last_error: Optional[Exception] = None
+        for provider in self.pool.candidates(text_length):
+            provider.in_flight += 1
+            start = time.perf_counter()
+            try:
+                content = await self._complete(text, provider)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                provider.record_failure()
+                last_error = e
+                continue
+            finally:
+                provider.in_flight -= 1
+            provider.record_success(time.perf_counter() - start)
+            return content
+        raise last_error or RuntimeError("No LLM providers available")
+
+    async def _hedged_complete(self, text: str, text_length: int = 0) -> str:
+        """
+        Run the completion, firing a second attempt if the first is slower
+        than the observed p95. The first attempt to finish wins and the
+        other is cancelled. Cancelling this coroutine cancels both attempts.
+        """
+        self._calls += 1
+        start = time.perf_counter()
+        delay = self._hedge_delay()
+
+        if delay is None:
+            content = await self._routed_complete(text, text_length)
+            self._latencies.append(time.perf_counter() - start)
+            return content
+
+        attempts = {asyncio.ensure_future(self._routed_complete(text, text_length))}
+        try:
+            done, _ = await asyncio.wait(attempts, timeout=delay)
+            if not done and self._hedge_allowed():
+                self._hedges += 1
+                # The in-flight first attempt lowers its provider's score,
+                # so the hedge usually lands on a different provider
+                attempts.add(asyncio.ensure_future(self._routed_complete(text, text_length)))
+
+            while True:
+                if not done:
+                    done, _ = await asyncio.wait(attempts, return_when=asyncio.FIRST_COMPLETED)
+                winner = next((t for t in done if not t.exception()), None)
+                if winner is not None:
+                    self._latencies.append(time.perf_counter() - start)
+                    return winner.result()
+                attempts -= done
+                if not attempts:
+                    # Every attempt failed; surface the first error
+                    raise next(iter(done)).exception()
+                done = set()
+        finally:
+            for t in attempts:
+                if not t.done():
+                    t.cancel()
+            for t in attempts:
+                with suppress(asyncio.CancelledError, Exception):
+                    await t
+
+    def _hedge_delay(self) -> Optional[float]:
+        """Observed p95 latency, or None when hedging is disabled or under-sampled"""
+        if not settings.LLM_HEDGE_ENABLED:
+            return None
+        if len(self._latencies) < settings.LLM_HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(self._latencies)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        return max(settings.LLM_HEDGE_MIN_DELAY, p95)
+
+    def _hedge_allowed(self) -> bool:
+        """Keep hedged calls within LLM_HEDGE_BUDGET of all calls"""
+        return (self._hedges + 1) <= settings.LLM_HEDGE_BUDGET * self._calls
+
+    def provider_stats(self) -> list:
+        """Per-provider routing stats"""
+        return self.pool.stats()
+
+    def prompt_stats(self) -> list:
+        """Token usage per prompt template"""
+        return prompt_registry.stats()
+
+    def scheduler_stats(self) -> Dict[str, Any]:
+        """Fair-queuing scheduler state: slots, queue depth and waits per class"""
+        return self.scheduler.stats()
+
     def _parse_json(self, content: str) -> Dict[str, Any]:
+        # Fast path: JSON mode usually returns a bare object
+        try:
+            data = orjson.loads(content)
+            if isinstance(data, dict):
+                return data
+        except orjson.JSONDecodeError:
+            pass
+
         try:
             fenced = re.search(r"```(?:json)?\s*(.*?)\s*```", content, re.DOTALL)
             if fenced:
                 content = fenced.group(1)
-            return json.loads(content)
+            return orjson.loads(content)
         except Exception:
             # Last resort: attempt to locate the first JSON object in the text
             m = re.search(r"\{[\s\S]*\}", content)
             if m:
-                return json.loads(m.group(0))
+                return orjson.loads(m.group(0))
             return {}
 
 
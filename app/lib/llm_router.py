@@ -0,0 +1,178 @@
+"""
+Provider pool for OpenAI-compatible LLM endpoints with latency-based routing
+"""
+
+import os
+import time
+from typing import Any, Dict, List, Optional, Set
+
+from openai import AsyncOpenAI
+
+from app.core.config import settings
+
+
+class LLMProvider:
+    """One OpenAI-compatible endpoint + model with live latency/error stats"""
+
+    def __init__(
+        self,
+        name: str,
+        model: str,
+        api_key: str,
+        base_url: Optional[str] = None,
+        weight: float = 1.0,
+        cost: float = 1.0,
+        output_mode: Optional[str] = None,
+        prompt_cache_key: Optional[bool] = None,
+    ) -> None:
+        self.name = name
+        self.model = model
+        self.api_key = api_key
+        self.base_url = base_url
+        self.weight = max(weight, 0.01)
+        self.cost = cost
+        self.client = AsyncOpenAI(api_key=api_key, base_url=base_url)
+        # Preferred structured-output mode; modes the endpoint rejected are skipped
+        self.output_mode = output_mode or settings.LLM_OUTPUT_MODE
+        self.unsupported_modes: Set[str] = set()
+        # Send prompt_cache_key (OpenAI's own API only, unless configured)
+        self.prompt_cache_key = base_url is None if prompt_cache_key is None else prompt_cache_key
+
+        # Live stats (EWMA latency in seconds, EWMA error rate 0..1)
+        self.ewma_latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.in_flight = 0
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+
+    def output_modes(self) -> List[str]:
+        """Structured-output modes to try, best first"""
+        chain = ("json_schema", "json_object", "text")
+        modes = [m for m in chain[chain.index(self.output_mode):] if m not in self.unsupported_modes]
+        return modes or ["text"]
+
+    def reset_client(self) -> None:
+        """Recreate the HTTP client (e.g. after fork) without losing stats"""
+        self.client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url)
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self.cooldown_until
+
+    def score(self) -> float:
+        """Lower is better: latency inflated by error rate and load, scaled by weight"""
+        latency = self.ewma_latency if self.ewma_latency is not None else settings.LLM_ROUTER_DEFAULT_LATENCY
+        penalty = 1.0 + settings.LLM_ROUTER_ERROR_PENALTY * self.error_rate
+        return latency * penalty * (1 + self.in_flight) / self.weight
+
+    def record_success(self, latency: float) -> None:
+        alpha = settings.LLM_ROUTER_EWMA_ALPHA
+        self.requests += 1
+        self.consecutive_failures = 0
+        self.ewma_latency = latency if self.ewma_latency is None else alpha * latency + (1 - alpha) * self.ewma_latency
+        self.error_rate = (1 - alpha) * self.error_rate
+
+    def record_failure(self) -> None:
+        alpha = settings.LLM_ROUTER_EWMA_ALPHA
+        self.requests += 1
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.error_rate = alpha + (1 - alpha) * self.error_rate
+        if self.consecutive_failures >= settings.LLM_ROUTER_FAILURE_THRESHOLD:
+            self.cooldown_until = time.monotonic() + settings.LLM_ROUTER_COOLDOWN
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "model": self.model,
+            "base_url": self.base_url,
+            "weight": self.weight,
+            "cost": self.cost,
+            "output_modes": self.output_modes(),
+            "available": self.available,
+            "ewma_latency_ms": round(self.ewma_latency * 1000, 2) if self.ewma_latency is not None else None,
+            "error_rate": round(self.error_rate, 4),
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "failures": self.failures,
+        }
+
+
+class ProviderPool:
+    """Routes calls across providers by EWMA latency and error rate"""
+
+    def __init__(self, providers: List[LLMProvider]) -> None:
+        self.providers = providers
+
+    @classmethod
+    def from_settings(cls) -> "ProviderPool":
+        """
+        Build the pool from LLM_PROVIDERS, falling back to the single
+        OPENAI_*/GEMINI_* endpoint when no pool is configured.
+        """
+        providers: List[LLMProvider] = []
+        for i, entry in enumerate(settings.LLM_PROVIDERS):
+            api_key = entry.get("api_key") or os.getenv(entry.get("api_key_env", ""), "")
+            if not api_key or not entry.get("model"):
+                continue
+            providers.append(
+                LLMProvider(
+                    name=entry.get("name") or f"provider-{i}",
+                    model=entry["model"],
+                    api_key=api_key,
+                    base_url=entry.get("base_url"),
+                    weight=float(entry.get("weight", 1.0)),
+                    cost=float(entry.get("cost", 1.0)),
+                    output_mode=entry.get("output_mode"),
+                    prompt_cache_key=entry.get("prompt_cache_key"),
+                )
+            )
+
+        if not providers:
+            api_key = (
+                settings.OPENAI_API_KEY
+                or os.getenv("OPENAI_API_KEY")
+                or os.getenv("GEMINI_API_KEY")
+                or ""
+            )
+            if api_key:
+                providers.append(
+                    LLMProvider(
+                        name="default",
+                        model=(
+                            settings.OPENAI_MODEL
+                            or os.getenv("OPENAI_MODEL")
+                            or os.getenv("GEMINI_MODEL")
+                            or "gpt-4o-2024-08-06"
+                        ),
+                        api_key=api_key,
+                        base_url=os.getenv("OPENAI_BASE_URL") or os.getenv("GEMINI_BASE_URL"),
+                    )
+                )
+        return cls(providers)
+
+    def candidates(self, text_length: int = 0) -> List[LLMProvider]:
+        """
+        Providers in the order they should be tried. Short inputs are pinned
+        to the cheapest available provider; everything else goes to the best
+        score first. Providers in cooldown are tried last.
+        """
+        available = [p for p in self.providers if p.available]
+        cooling = [p for p in self.providers if not p.available]
+
+        ordered = sorted(available, key=lambda p: p.score())
+        if ordered and 0 < text_length <= settings.LLM_SHORT_INPUT_CHARS:
+            cheapest = min(ordered, key=lambda p: (p.cost, p.score()))
+            ordered.remove(cheapest)
+            ordered.insert(0, cheapest)
+
+        return ordered + sorted(cooling, key=lambda p: p.cooldown_until)
+
+    def reset_clients(self) -> None:
+        for p in self.providers:
+            p.reset_client()
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [p.stats() for p in self.providers]
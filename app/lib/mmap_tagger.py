@@ -0,0 +1,162 @@
+"""
+Read-only, memory-mapped copy of NLTK's averaged perceptron tagger
+
+The pickled NLTK model unpickles into nested dicts of Python floats (tens of
+MB per process). Exported once to .npy files - sorted feature strings plus a
+CSR weight table - the same model is mapped read-only by every worker, so
+the pages live once in the page cache no matter how many workers there are.
+
+Tagging reproduces PerceptronTagger.tag exactly: same features, same
+accumulation order, same (score, label) tie-break.
+
+Usage (export ahead of time, e.g. at image build):
+    python -m app.lib.mmap_tagger [directory]
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+FORMAT_VERSION = 1
+ARRAYS = ("features", "indptr", "labels", "weights", "tagdict_words", "tagdict_tags")
+
+
+def _sorted_bytes(values: Sequence[str]) -> Tuple[np.ndarray, List[int]]:
+    """UTF-8 encode, sort and pack strings into a fixed-width S array. Returns (array, order)."""
+    encoded = [v.encode("utf-8") for v in values]
+    order = sorted(range(len(encoded)), key=encoded.__getitem__)
+    width = max((len(e) for e in encoded), default=1) or 1
+    return np.array([encoded[i] for i in order], dtype=f"S{width}"), order
+
+
+def _lookup(table: np.ndarray, keys: List[bytes]) -> np.ndarray:
+    """Row index of each key in a sorted S array, -1 when absent"""
+    if not len(table) or not keys:
+        return np.full(len(keys), -1, dtype=np.int64)
+    width = table.dtype.itemsize
+    query = np.array(keys, dtype=table.dtype)
+    pos = np.minimum(np.searchsorted(table, query), len(table) - 1)
+    found = table[pos] == query
+    if max(map(len, keys)) > width:
+        # Longer keys were truncated by the cast; they cannot be in the table
+        found &= np.fromiter((len(k) <= width for k in keys), dtype=bool, count=len(keys))
+    return np.where(found, pos, -1)
+
+
+def export_tagger(tagger: Any, directory: str) -> Path:
+    """Write a loaded nltk PerceptronTagger to `directory` as .npy files"""
+    target = Path(directory)
+    target.mkdir(parents=True, exist_ok=True)
+
+    classes = sorted(tagger.classes)
+    class_index = {c: i for i, c in enumerate(classes)}
+
+    names = list(tagger.model.weights)
+    features, order = _sorted_bytes(names)
+    rows = [tagger.model.weights[names[i]] for i in order]
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(r) for r in rows])
+    labels = np.fromiter((class_index[l] for r in rows for l in r), dtype=np.int16, count=int(indptr[-1]))
+    values = np.fromiter((w for r in rows for w in r.values()), dtype=np.float64, count=int(indptr[-1]))
+
+    words, word_order = _sorted_bytes(list(tagger.tagdict))
+    tag_values = list(tagger.tagdict.values())
+    tags = np.array([class_index[tag_values[i]] for i in word_order], dtype=np.int16)
+
+    arrays = {
+        "features": features,
+        "indptr": indptr,
+        "labels": labels,
+        "weights": values,
+        "tagdict_words": words,
+        "tagdict_tags": tags,
+    }
+    for name, array in arrays.items():
+        tmp = target / f"{name}.npy.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            np.save(f, array)
+        os.replace(tmp, target / f"{name}.npy")
+
+    # Manifest last: its presence marks a complete export
+    meta = {"version": FORMAT_VERSION, "classes": classes, "features": len(features), "tagdict": len(words)}
+    tmp = target / f"meta.json.{os.getpid()}.tmp"
+    tmp.write_text(json.dumps(meta))
+    os.replace(tmp, target / "meta.json")
+    return target
+
+
+class MmapPerceptronTagger:
+    """Drop-in for PerceptronTagger.tag backed by memory-mapped arrays"""
+
+    START = ["-START-", "-START2-"]
+    END = ["-END-", "-END2-"]
+
+    def __init__(self, directory: str) -> None:
+        path = Path(directory)
+        meta = json.loads((path / "meta.json").read_text())
+        if meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported tagger export version: {meta.get('version')}")
+        self.classes: List[str] = meta["classes"]
+        for name in ARRAYS:
+            # Plain ndarray views of the mapping: same pages, without np.memmap's
+            # per-indexing subclass overhead
+            setattr(self, f"_{name}", np.asarray(np.load(path / f"{name}.npy", mmap_mode="r")))
+
+    @classmethod
+    def load_or_export(cls, directory: str) -> "MmapPerceptronTagger":
+        """Map an existing export, or export the installed NLTK model first"""
+        if not (Path(directory) / "meta.json").exists():
+            from nltk.tag import PerceptronTagger
+
+            export_tagger(PerceptronTagger(), directory)
+        return cls(directory)
+
+    def tag(self, tokens: List[str]) -> List[Tuple[str, str]]:
+        from nltk.tag.perceptron import PerceptronTagger
+
+        prev, prev2 = self.START
+        output: List[Tuple[str, str]] = []
+        context = self.START + [PerceptronTagger.normalize(self, w) for w in tokens] + self.END
+
+        known = _lookup(self._tagdict_words, [w.encode("utf-8") for w in tokens])
+        for i, word in enumerate(tokens):
+            tag: Optional[str] = self.classes[self._tagdict_tags[known[i]]] if known[i] >= 0 else None
+            if not tag:
+                features = PerceptronTagger._get_features(self, i, word, context, prev, prev2)
+                tag = self._predict(features)
+            output.append((word, tag))
+            prev2 = prev
+            prev = tag
+        return output
+
+    def _predict(self, features: dict) -> str:
+        names = list(features)
+        rows = _lookup(self._features, [n.encode("utf-8") for n in names])
+        hit = rows >= 0
+        rows = rows[hit]
+        counts = np.fromiter((features[n] for n in names), dtype=np.float64, count=len(names))[hit]
+
+        starts = self._indptr[rows]
+        lengths = self._indptr[rows + 1] - starts
+        # Flatten the CSR rows in feature order so bincount accumulates
+        # exactly like AveragedPerceptron.predict's nested loop
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        scores = np.bincount(
+            self._labels[offsets],
+            weights=np.repeat(counts, lengths) * self._weights[offsets],
+            minlength=len(self.classes),
+        )
+        # max(classes, key=(score, label)): highest score, ties to the larger label
+        return self.classes[int(np.flatnonzero(scores == scores.max())[-1])]
+
+
+if __name__ == "__main__":
+    from app.core.config import settings
+    from nltk.tag import PerceptronTagger
+
+    out = export_tagger(PerceptronTagger(), sys.argv[1] if len(sys.argv) > 1 else settings.NLP_MMAP_DIR)
+    print(f"Exported tagger to {out}")
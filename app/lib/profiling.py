@@ -0,0 +1,272 @@
+"""
+On-demand, per-process profiling: a sampling profiler, an event-loop
+stall monitor and a slow-request log with per-stage timings
+
+Everything is off until switched on (settings or /api/debug). While off,
+`stage()` is a context-var lookup returning a shared no-op context.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger("profiling")
+
+# Leaf frames of threads that are parked rather than doing work
+IDLE_FRAMES = frozenset({
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+})
+
+_labels: Dict[Any, str] = {}
+
+
+def _label(code) -> str:
+    label = _labels.get(code)
+    if label is None:
+        path = code.co_filename
+        for prefix in sorted(sys.path, key=len, reverse=True):
+            if prefix and path.startswith(prefix + os.sep):
+                path = path[len(prefix) + 1:]
+                break
+        label = f"{code.co_name} ({path}:{code.co_firstlineno})".replace(";", ":")
+        _labels[code] = label
+    return label
+
+
+def collapse(frame, root: str = "") -> str:
+    """Frame chain as a collapsed stack line, outermost first"""
+    labels = []
+    while frame is not None:
+        labels.append(_label(frame.f_code))
+        frame = frame.f_back
+    if root:
+        labels.append(root)
+    return ";".join(reversed(labels))
+
+
+def _is_idle(frame) -> bool:
+    code = frame.f_code
+    return (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES
+
+
+class ProfilerBusy(RuntimeError):
+    """A profile is already being recorded in this process"""
+
+
+class SamplingProfiler:
+    """Samples every thread's stack from a background thread (no tracing hooks)"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._lock.locked()
+
+    def run(self, seconds: float, interval: float, include_idle: bool = False) -> Counter:
+        """Sample for `seconds` every `interval` seconds; blocks the calling thread"""
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusy("A profile is already running")
+        try:
+            me = threading.get_ident()
+            stacks: Counter = Counter()
+            deadline = time.perf_counter() + seconds
+            while time.perf_counter() < deadline:
+                names = {t.ident: t.name for t in threading.enumerate()}
+                for ident, frame in sys._current_frames().items():
+                    if ident == me or (not include_idle and _is_idle(frame)):
+                        continue
+                    stacks[collapse(frame, names.get(ident, str(ident)))] += 1
+                time.sleep(interval)
+            return stacks
+        finally:
+            self._lock.release()
+
+    @staticmethod
+    def format(stacks: Counter) -> str:
+        """Collapsed-stack text (flamegraph.pl, speedscope, inferno)"""
+        return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+class LoopMonitor:
+    """
+    Detects callbacks that block the event loop longer than a threshold.
+
+    A heartbeat task stamps the time every threshold/4; a watchdog thread
+    notices a stale stamp while the loop is still blocked and records the
+    loop thread's stack at that moment. Unlike asyncio debug mode
+    (slow_callback_duration) this shows what was blocking and costs one
+    wake-up per interval.
+    """
+
+    def __init__(self, max_events: int = 100) -> None:
+        self.threshold: float = 0.0
+        self.events: Deque[Dict[str, Any]] = deque(maxlen=max_events)
+        self._beat = 0.0
+        self._pending: Optional[Dict[str, Any]] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stop: Optional[threading.Event] = None
+        self._loop_thread = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._task is not None
+
+    def start(self, threshold_ms: float) -> None:
+        """(Re)start on the running loop; threshold_ms <= 0 stops it"""
+        self.stop()
+        if threshold_ms <= 0:
+            return
+        self.threshold = threshold_ms / 1000.0
+        self._loop_thread = threading.get_ident()
+        self._beat = time.perf_counter()
+        self._stop = threading.Event()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        threading.Thread(target=self._watch, args=(self._stop,), name="loop-monitor", daemon=True).start()
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._stop is not None:
+            self._stop.set()
+            self._stop = None
+        self.threshold = 0.0
+
+    @property
+    def _interval(self) -> float:
+        return self.threshold / 4
+
+    async def _heartbeat(self) -> None:
+        while True:
+            now = time.perf_counter()
+            event = self._pending
+            if event is not None:
+                event["blocked_ms"] = round((now - self._beat - self._interval) * 1000, 1)
+                self._pending = None
+                logger.warning("Event loop blocked for %.1f ms in %s", event["blocked_ms"], event["stack"].rsplit(";", 1)[-1])
+            self._beat = now
+            await asyncio.sleep(self._interval)
+
+    def _watch(self, stop: threading.Event) -> None:
+        interval = self._interval
+        while not stop.wait(interval):
+            beat = self._beat
+            lag = time.perf_counter() - beat - interval
+            if lag < self.threshold or self._pending is not None:
+                continue
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is None:
+                continue
+            event = {
+                "detected_at": time.time(),
+                "blocked_ms": None,  # filled in when the loop resumes
+                "stack": collapse(frame),
+            }
+            # The loop may have resumed between reading the stamp and the stack
+            if self._beat == beat:
+                self._pending = event
+                self.events.append(event)
+
+
+class RequestTrace:
+    """Accumulated seconds per stage for one request"""
+
+    __slots__ = ("name", "start", "stages")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.start = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+
+class _Stage:
+    __slots__ = ("trace", "name", "start")
+
+    def __init__(self, trace: RequestTrace, name: str) -> None:
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc) -> None:
+        self.trace.add(self.name, time.perf_counter() - self.start)
+
+
+current_trace: ContextVar[Optional[RequestTrace]] = ContextVar("current_trace", default=None)
+_NO_STAGE = nullcontext()
+
+
+def stage(name: str):
+    """Time the enclosed block as `name` in the current request trace, if any"""
+    trace = current_trace.get()
+    return _NO_STAGE if trace is None else _Stage(trace, name)
+
+
+def add_stage(name: str, seconds: float) -> None:
+    """Record an already measured duration in the current request trace, if any"""
+    trace = current_trace.get()
+    if trace is not None:
+        trace.add(name, seconds)
+
+
+class SlowRequestLog:
+    """Keeps (and logs) the stage breakdown of requests slower than threshold_ms"""
+
+    def __init__(self, threshold_ms: float = 0.0, max_entries: int = 100) -> None:
+        self.threshold_ms = threshold_ms
+        self.entries: Deque[Dict[str, Any]] = deque(maxlen=max_entries)
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold_ms > 0
+
+    @contextmanager
+    def trace(self, name: str) -> Iterator[Optional[RequestTrace]]:
+        """Trace the enclosed request; yields None (and records nothing) while disabled"""
+        if not self.enabled:
+            yield None
+            return
+        trace = RequestTrace(name)
+        token = current_trace.set(trace)
+        try:
+            yield trace
+        finally:
+            current_trace.reset(token)
+            self.finish(trace)
+
+    def finish(self, trace: RequestTrace) -> None:
+        total_ms = (time.perf_counter() - trace.start) * 1000
+        if total_ms < self.threshold_ms:
+            return
+        stages = {k: round(v * 1000, 2) for k, v in trace.stages.items()}
+        stages["other"] = round(max(total_ms - sum(trace.stages.values()) * 1000, 0.0), 2)
+        entry = {"request": trace.name, "at": time.time(), "total_ms": round(total_ms, 2), "stages_ms": stages}
+        self.entries.append(entry)
+        logger.warning("Slow request %s: %.1f ms %s", trace.name, total_ms, stages)
+
+    def recent(self) -> List[Dict[str, Any]]:
+        return list(reversed(self.entries))
+
+
+# Global instances (per process)
+profiler = SamplingProfiler()
+loop_monitor = LoopMonitor(settings.PROFILE_MAX_EVENTS)
+slow_requests = SlowRequestLog(settings.SLOW_REQUEST_MS, settings.PROFILE_MAX_EVENTS)
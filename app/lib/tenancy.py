@@ -0,0 +1,72 @@
+"""
+Per-request tenant context: who is calling, how their LLM work is
+scheduled, and how many tokens it consumed
+
+Set by the API (from the API key) and the job workers around an analysis;
+read by LLMClient without threading extra arguments through the service
+layer. Tasks created inside the scope inherit it.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, replace
+from typing import Any, Iterator, Optional
+
+PRIORITIES = ("interactive", "bulk")
+
+
+@dataclass(frozen=True)
+class Tenant:
+    """Resolved API key (or the anonymous caller when keys are optional)"""
+
+    key_id: Optional[int]
+    name: str
+    weight: float = 1.0
+    priority: str = "interactive"
+    is_admin: bool = False
+
+    def with_priority(self, priority: str) -> "Tenant":
+        return self if priority == self.priority else replace(self, priority=priority)
+
+
+ANONYMOUS = Tenant(key_id=None, name="anonymous")
+
+
+@dataclass
+class TokenUsage:
+    """LLM calls and tokens consumed while a tenant scope is active"""
+
+    calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+    def add(self, usage: Any) -> None:
+        """Add an OpenAI-style `usage` object (missing on some providers)"""
+        self.calls += 1
+        if usage is not None:
+            self.prompt_tokens += getattr(usage, "prompt_tokens", 0) or 0
+            self.completion_tokens += getattr(usage, "completion_tokens", 0) or 0
+
+
+current_tenant: ContextVar[Tenant] = ContextVar("current_tenant", default=ANONYMOUS)
+current_usage: ContextVar[Optional[TokenUsage]] = ContextVar("current_usage", default=None)
+
+
+@contextmanager
+def tenant_scope(tenant: Tenant, usage: Optional[TokenUsage] = None) -> Iterator[TokenUsage]:
+    """Run the enclosed analysis as `tenant`, metering LLM usage into `usage`"""
+    usage = usage if usage is not None else TokenUsage()
+    tenant_token = current_tenant.set(tenant)
+    usage_token = current_usage.set(usage)
+    try:
+        yield usage
+    finally:
+        current_usage.reset(usage_token)
+        current_tenant.reset(tenant_token)
+
+
+def record_llm_usage(usage: Any) -> None:
+    """Called after every completion; no-op outside a tenant scope"""
+    meter = current_usage.get()
+    if meter is not None:
+        meter.add(usage)
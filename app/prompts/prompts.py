@@ -1,7 +1,39 @@
 """
 Prompts for generating text analysis results
+
+Every template keeps its instructions in the system message and sends the
+input text alone as the user message, so the static part is an identical
+prefix across calls and provider-side prefix caching applies. Templates are
+registered by (name, variant, version) in app/prompts/registry.py.
 """
 
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """One versioned prompt: static system instructions + user message layout"""
+
+    name: str
+    variant: str  # full | compact | schema
+    version: int
+    system: str
+    user: str = "{text}"
+
+    @property
+    def id(self) -> str:
+        return f"{self.name}.{self.variant}.v{self.version}"
+
+    def render(self, text: str) -> List[Dict[str, str]]:
+        return [
+            {"role": "system", "content": self.system},
+            {"role": "user", "content": self.user.format(text=text)},
+        ]
+
+
+# v1: the original layout (text in the middle of the instructions), kept so
+# it can be pinned with PROMPT_VERSIONS for comparison or rollback
 COMPREHENSIVE_ANALYSIS_PROMPT = """
 Analyze the following text and provide a comprehensive analysis.
 
@@ -13,3 +45,50 @@ For the given text, generate:
 
 Text: {text}
 """
+
+COMPREHENSIVE_FULL_V2 = """Analyze the text in the user message and return only a JSON object with these keys:
+- title: A descriptive title (max 8 words). If the text has a title, use it; otherwise write a brief one.
+- summary: A concise 1-2 sentence summary focusing on the main points and key information.
+- sentiment: The overall sentiment. Exactly one of "positive", "negative" or "neutral".
+- topics: An array of exactly 3 key topics or themes, each 1-3 words."""
+
+COMPREHENSIVE_COMPACT_V2 = """Return only JSON for the user's text: {"title": <=8 words, "summary": 1-2 sentences, "sentiment": "positive"|"negative"|"neutral", "topics": [3 topics, 1-3 words each]}."""
+
+# With structured output the schema carries field names and constraints
+COMPREHENSIVE_SCHEMA_V2 = """Analyze the user's text. Title: max 8 words, reuse an existing title. Summary: 1-2 sentences on the main points. Topics: exactly 3, 1-3 words each."""
+
+ANALYSIS_JSON_SCHEMA: Dict[str, Any] = {
+    "name": "text_analysis",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "title": {"type": "string", "description": "Descriptive title, max 8 words"},
+            "summary": {"type": "string", "description": "1-2 sentence summary"},
+            "sentiment": {"type": "string", "enum": ["positive", "negative", "neutral"]},
+            "topics": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Exactly 3 key topics, 1-3 words each",
+            },
+        },
+        "required": ["title", "summary", "sentiment", "topics"],
+        "additionalProperties": False,
+    },
+}
+
+TEMPLATES = [
+    PromptTemplate(
+        name="comprehensive",
+        variant="full",
+        version=1,
+        system=(
+            "Return only a strict JSON object with keys: "
+            "title, summary, sentiment, topics (exactly 3 items)."
+        ),
+        user=COMPREHENSIVE_ANALYSIS_PROMPT,
+    ),
+    PromptTemplate(name="comprehensive", variant="full", version=2, system=COMPREHENSIVE_FULL_V2),
+    PromptTemplate(name="comprehensive", variant="compact", version=2, system=COMPREHENSIVE_COMPACT_V2),
+    PromptTemplate(name="comprehensive", variant="schema", version=2, system=COMPREHENSIVE_SCHEMA_V2),
+]
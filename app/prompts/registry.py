@@ -0,0 +1,87 @@
+"""
+Versioned prompt template registry with per-template token accounting
+"""
+
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.prompts.prompts import TEMPLATES, PromptTemplate
+
+OUTPUT_MODES = ("json_schema", "json_object", "text")
+
+
+class PromptRegistry:
+    def __init__(self, templates: List[PromptTemplate]) -> None:
+        self._templates: Dict[Tuple[str, str], Dict[int, PromptTemplate]] = {}
+        self._lock = threading.Lock()
+        self._usage: Dict[str, Dict[str, int]] = {}
+        for template in templates:
+            self.register(template)
+
+    def register(self, template: PromptTemplate) -> None:
+        self._templates.setdefault((template.name, template.variant), {})[template.version] = template
+
+    def get(self, name: str, variant: str, version: Optional[int] = None) -> PromptTemplate:
+        """
+        A template by variant, at `version`, the version pinned in
+        PROMPT_VERSIONS, or the latest. Missing variants fall back to "full".
+        """
+        version = version if version is not None else settings.PROMPT_VERSIONS.get(name)
+        for candidate in (variant, "full"):
+            versions = self._templates.get((name, candidate))
+            if not versions:
+                continue
+            if version is None:
+                return versions[max(versions)]
+            if version in versions:
+                return versions[version]
+        raise KeyError(f"No prompt template {name}.{variant} (version {version})")
+
+    def select(self, name: str, text_length: int, output_mode: str) -> PromptTemplate:
+        """
+        Pick the variant for a call: "schema" when the provider enforces a
+        JSON schema, "compact" for inputs up to PROMPT_COMPACT_MAX_CHARS
+        (where the instructions would dominate the input), else "full".
+        """
+        if output_mode == "json_schema":
+            variant = "schema"
+        elif text_length <= settings.PROMPT_COMPACT_MAX_CHARS:
+            variant = "compact"
+        else:
+            variant = "full"
+        return self.get(name, variant)
+
+    def record_usage(self, template_id: str, usage: Any) -> None:
+        """Add one call's OpenAI-style `usage` to the template's counters"""
+        details = getattr(usage, "prompt_tokens_details", None)
+        with self._lock:
+            entry = self._usage.setdefault(
+                template_id,
+                {"calls": 0, "prompt_tokens": 0, "cached_tokens": 0, "completion_tokens": 0},
+            )
+            entry["calls"] += 1
+            if usage is not None:
+                entry["prompt_tokens"] += getattr(usage, "prompt_tokens", 0) or 0
+                entry["completion_tokens"] += getattr(usage, "completion_tokens", 0) or 0
+                entry["cached_tokens"] += getattr(details, "cached_tokens", 0) or 0
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Token usage per template in this process, with averages per call"""
+        with self._lock:
+            usage = {k: dict(v) for k, v in self._usage.items()}
+        out = []
+        for template_id, entry in sorted(usage.items()):
+            calls = entry["calls"] or 1
+            out.append({
+                "template": template_id,
+                **entry,
+                "avg_prompt_tokens": round(entry["prompt_tokens"] / calls, 1),
+                "avg_completion_tokens": round(entry["completion_tokens"] / calls, 1),
+                "cache_hit_ratio": round(entry["cached_tokens"] / entry["prompt_tokens"], 4) if entry["prompt_tokens"] else 0.0,
+            })
+        return out
+
+
+# Global instance
+prompt_registry = PromptRegistry(TEMPLATES)
@@ -3,55 +3,142 @@ API endpoints for text analysis
 """
 
 import time
-from fastapi import APIRouter, HTTPException, Depends
+from datetime import datetime
+from typing import Literal, Optional
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Request
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+import orjson
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, text
+from sqlalchemy import func
 from app.models.schemas import TextAnalysisRequest, TextAnalysisResponse, ErrorResponse
 from app.services.text_analyzer import text_analyzer_service
-from app.database.database import get_db
-from app.database.models import TextAnalysis
+from app.services import api_keys, archive, export, jobs
+from app.services.history import filter_history
+from app.services.storage import store_analysis
+from app.services.documents import document_store
+from app.services.embeddings import vector_index
+from app.lib.embeddings import text_encoder
+from app.lib.llm_client import llm_client
+from app.lib.profiling import slow_requests, stage
+from app.lib.tenancy import Tenant, TokenUsage, tenant_scope
+from app.core.auth import get_tenant, require_admin
+from app.database.database import SessionLocal, get_db
+from app.database.models import TextAnalysis, AnalysisJob
+from app.core.config import settings
 from app.utils.logger import log_request, log_error
+from app.utils.http_cache import (
+    ResponseCache,
+    make_etag,
+    is_not_modified,
+    validator_headers,
+    conditional_response,
+)
+from app.utils.deadline import (
+    run_with_deadline,
+    resolve_timeout,
+    DeadlineExceeded,
+    ClientDisconnected,
+)
 
 router = APIRouter()
 
+# Columns returned by /history; rows are fetched as plain tuples (no ORM
+# instances) and zipped straight into dicts that orjson serializes natively
+HISTORY_COLUMNS = (
+    TextAnalysis.id,
+    TextAnalysis.title,
+    TextAnalysis.summary,
+    TextAnalysis.topics,
+    TextAnalysis.sentiment,
+    TextAnalysis.keywords,
+    TextAnalysis.processing_time,
+    TextAnalysis.created_at,
+)
+HISTORY_FIELDS = tuple(c.key for c in HISTORY_COLUMNS)
+
+# Serialized /history pages keyed by their filter parameters
+history_cache = ResponseCache(settings.HISTORY_CACHE_TTL, settings.HISTORY_CACHE_MAX_ENTRIES)
+
+
+def serialize_history_rows(rows) -> list:
+    """Turn (id, title, ...) row tuples into response dicts"""
+    fields = HISTORY_FIELDS
+    return [dict(zip(fields, row)) for row in rows]
+
 
 @router.post(
     "/analyze",
     response_model=TextAnalysisResponse,
     responses={
         400: {"model": ErrorResponse, "description": "Bad Request"},
-        500: {"model": ErrorResponse, "description": "Internal Server Error"}
+        202: {"description": "Job queued (async=true)"},
+        500: {"model": ErrorResponse, "description": "Internal Server Error"},
+        504: {"model": ErrorResponse, "description": "Request Deadline Exceeded"}
     },
     summary="Analyze Text",
     description="Analyze unstructured text to extract summary, metadata, sentiment, and keywords"
 )
-async def analyze_text(request: TextAnalysisRequest, db: Session = Depends(get_db)) -> TextAnalysisResponse:
+async def analyze_text(
+    request: TextAnalysisRequest,
+    http_request: Request,
+    x_request_timeout: Optional[float] = Header(None),
+    run_async: bool = Query(False, alias="async", description="Queue the analysis and return a job id"),
+    webhook_url: Optional[str] = Query(None, description="URL to POST the job result to (async only)"),
+    x_priority: Optional[Literal["interactive", "bulk"]] = Header(None),
+    tenant: Tenant = Depends(get_tenant),
+    db: Session = Depends(get_db)
+) -> TextAnalysisResponse:
     """
     Analyze text and return comprehensive results including:
     - 1-2 sentence summary
     - Extracted metadata (title, topics)
     - Sentiment analysis
     - Top keywords
+
+    The analysis runs under a deadline (X-Request-Timeout header or
+    REQUEST_TIMEOUT) and is cancelled if the client disconnects.
+    With `async=true` the request is queued for the job workers instead;
+    poll GET /api/jobs/{job_id} or pass `webhook_url`.
+    
+    The LLM call waits for a slot in the fair-share scheduler: interactive
+    requests go ahead of bulk ones (keys created as bulk, or
+    `X-Priority: bulk`), and tenants share slots by key weight. Requests
+    and tokens are accounted to the API key.
     """
     start_time = time.time()
+    timeout = resolve_timeout(x_request_timeout, settings.REQUEST_TIMEOUT, settings.MAX_REQUEST_TIMEOUT)
+    # Callers may demote themselves to bulk, never promote a bulk key
+    if x_priority == "bulk":
+        tenant = tenant.with_priority("bulk")
     
-    try:
-        result = await text_analyzer_service.analyze_text(request)
-        
-        # Store analysis result in database
-        db_analysis = TextAnalysis(
-            original_text=request.text,
-            summary=result.summary,
-            title=result.metadata.title,
-            topics=result.metadata.topics,
-            sentiment=result.metadata.sentiment,
-            keywords=result.metadata.keywords,
-            processing_time=result.processing_time,
-            confidence_score=result.confidence_score,
+    if run_async:
+        try:
+            job = jobs.enqueue(db, request, webhook_url, api_key_id=tenant.key_id)
+        except Exception as e:
+            log_error(e, "enqueue_analysis")
+            raise HTTPException(status_code=500, detail=f"Failed to queue analysis: {str(e)}")
+        return ORJSONResponse(
+            {"job_id": job.id, "status": job.status, "status_url": f"/api/jobs/{job.id}"},
+            status_code=202,
         )
-        db.add(db_analysis)
-        db.commit()
-        db.refresh(db_analysis)
+    
+    usage = TokenUsage()
+    try:
+        with slow_requests.trace("POST /api/analyze"):
+            with tenant_scope(tenant, usage):
+                result = await run_with_deadline(
+                    text_analyzer_service.analyze_text(request),
+                    timeout=timeout,
+                    request=http_request,
+                )
+            
+            # Store analysis result and the key's usage in one transaction
+            with stage("store"):
+                store_analysis(db, request.text, result)
+                api_keys.record_usage(db, tenant, usage)
+            with stage("db_commit"):
+                db.commit()
+        history_cache.invalidate()
         
         # Log successful request
         response_time = time.time() - start_time
@@ -62,10 +149,20 @@ async def analyze_text(request: TextAnalysisRequest, db: Session = Depends(get_d
             response_time=response_time
         )
         
-        return result
+        return ORJSONResponse(result.model_dump())
+    except DeadlineExceeded as e:
+        log_error(e, "text_analysis")
+        _record_failed_usage(db, tenant, usage)
+        raise HTTPException(status_code=504, detail=f"Text analysis timed out after {timeout:.2f}s")
+    except ClientDisconnected as e:
+        # Nobody is listening; the upstream call has already been cancelled
+        log_error(e, "text_analysis")
+        _record_failed_usage(db, tenant, usage)
+        raise HTTPException(status_code=499, detail="Client closed request")
     except Exception as e:
         # Log error
         log_error(e, "text_analysis")
+        _record_failed_usage(db, tenant, usage)
         
         raise HTTPException(
             status_code=500,
@@ -73,76 +170,133 @@ async def analyze_text(request: TextAnalysisRequest, db: Session = Depends(get_d
         )
 
 
+def _record_failed_usage(db: Session, tenant: Tenant, usage: TokenUsage) -> None:
+    """Account a failed request (tokens already spent still count); never raises"""
+    if tenant.key_id is None:
+        return
+    try:
+        db.rollback()
+        api_keys.record_usage(db, tenant, usage, failed=True)
+        db.commit()
+    except Exception as e:
+        log_error(e, "record_usage")
+
+
+@router.get(
+    "/usage",
+    summary="API Key Usage",
+    description="Requests and LLM tokens per day for the calling key, or for every key (admin, all=true)"
+)
+async def key_usage(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    all_keys: bool = Query(False, alias="all"),
+    tenant: Tenant = Depends(get_tenant),
+    db: Session = Depends(get_db)
+):
+    """Usage report from api_key_usage (defaults to the last 30 days)"""
+    if all_keys and not tenant.is_admin:
+        raise HTTPException(status_code=403, detail="Admin API key required")
+    if not all_keys and tenant.key_id is None:
+        raise HTTPException(status_code=401, detail="API key required", headers={"WWW-Authenticate": "Bearer"})
+    try:
+        return {"keys": api_keys.usage_report(db, None if all_keys else tenant.key_id, start, end)}
+    except Exception as e:
+        log_error(e, "key_usage")
+        raise HTTPException(status_code=500, detail=f"Failed to fetch usage: {str(e)}")
+
+
 @router.get(
     "/history",
     summary="Get Analysis History",
-    description="Get a list of previous text analyses with optional filtering"
+    description="Get a list of previous text analyses with optional filtering",
+    dependencies=[Depends(get_tenant)]
 )
 async def get_analysis_history(
+    http_request: Request,
     skip: int = 0,
     limit: int = 20,
     sentiment: str = None,
     keyword: str = None,
     search: str = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    include_archived: bool = False,
     db: Session = Depends(get_db)
 ):
-    """Get analysis history with pagination and filtering"""
+    """Get analysis history with pagination and filtering
+    
+    `start`/`end` bound created_at (and let Postgres prune partitions);
+    `include_archived` also reads rows from archived (dropped) partitions;
+    it needs `start` and `end` (at most ARCHIVE_QUERY_MAX_DAYS apart), and
+    `total_exact` is false when older archive files were not read for the page.
+    
+    Responses carry an ETag/Last-Modified derived from the filtered result
+    set (count, max id, latest change), so unchanged pages revalidate with
+    304, and serialized pages are cached briefly per filter set.
+    """
+    if include_archived:
+        # Archive reads are bounded by the requested span
+        if start is None or end is None:
+            raise HTTPException(status_code=400, detail="include_archived requires start and end")
+        if (end.replace(tzinfo=None) - start.replace(tzinfo=None)).days > settings.ARCHIVE_QUERY_MAX_DAYS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"include_archived spans are limited to {settings.ARCHIVE_QUERY_MAX_DAYS} days"
+            )
+    
+    cache_key = (skip, limit, sentiment, keyword, search, start, end, include_archived)
+    cached = history_cache.get(cache_key)
+    if cached is not None:
+        return conditional_response(http_request, cached)
+    
     try:
-        # Build base query
-        query = db.query(TextAnalysis)
-        
-        # Apply filters
-        if sentiment and sentiment.lower() in ['positive', 'negative', 'neutral']:
-            query = query.filter(TextAnalysis.sentiment == sentiment.lower())
+        query = filter_history(db.query(TextAnalysis), sentiment, keyword, search, start, end)
         
-        if keyword:
-            # Search for keyword in the keywords JSON array using raw SQL
-            keyword_lower = keyword.lower()
-            query = query.filter(
-                text("keywords::text ILIKE :keyword")
-            ).params(keyword=f"%{keyword_lower}%")
+        # Count for pagination plus the result-set fingerprint, in one query
+        total_count, max_id, last_modified = query.with_entities(
+            func.count(TextAnalysis.id),
+            func.max(TextAnalysis.id),
+            func.max(func.coalesce(TextAnalysis.updated_at, TextAnalysis.created_at)),
+        ).one()
+        etag = make_etag(cache_key, total_count, max_id, last_modified)
+        if is_not_modified(http_request, etag, last_modified):
+            # Client copy is current: skip fetching and serializing rows
+            return Response(status_code=304, headers=validator_headers(etag, last_modified))
         
-        if search:
-            # Search in original text, summary, and title
-            # Note: Topics search is complex with JSON, so we'll search in text fields only
-            search_term = f"%{search.lower()}%"
-            query = query.filter(
-                or_(
-                    TextAnalysis.original_text.ilike(search_term),
-                    TextAnalysis.summary.ilike(search_term),
-                    TextAnalysis.title.ilike(search_term)
-                )
+        total_exact = True
+        if include_archived:
+            rows, total_count, total_exact = _merge_archived_history(
+                query, total_count, skip, limit, sentiment, keyword, search, start, end
+            )
+        else:
+            # Apply ordering, pagination and execute
+            rows = (
+                query.with_entities(*HISTORY_COLUMNS)
+                .order_by(TextAnalysis.created_at.desc())
+                .offset(skip)
+                .limit(limit)
+                .all()
             )
         
-        # Get total count for pagination
-        total_count = query.count()
-        
-        # Apply ordering, pagination and execute
-        analyses = query.order_by(TextAnalysis.created_at.desc()).offset(skip).limit(limit).all()
-        
-        return {
-            "analyses": [
-                {
-                    "id": analysis.id,
-                    "title": analysis.title,
-                    "summary": analysis.summary,
-                    "topics": analysis.topics,
-                    "sentiment": analysis.sentiment,
-                    "keywords": analysis.keywords,
-                    "processing_time": analysis.processing_time,
-                    "created_at": analysis.created_at.isoformat() if analysis.created_at else None
-                }
-                for analysis in analyses
-            ],
+        # Serialized once with orjson (no jsonable_encoder) and cached as bytes
+        body = orjson.dumps({
+            "analyses": serialize_history_rows(rows),
             "total": total_count,
+            "total_exact": total_exact,
             "skip": skip,
             "limit": limit,
             "filters": {
                 "sentiment": sentiment,
                 "keyword": keyword,
-                "search": search
+                "search": search,
+                "start": start,
+                "end": end,
+                "include_archived": include_archived
             }
-        }
+        })
+        entry = history_cache.set(cache_key, body, etag, last_modified)
+        return conditional_response(http_request, entry)
     except Exception as e:
         log_error(e, "get_analysis_history")
         raise HTTPException(
@@ -151,6 +305,172 @@ async def get_analysis_history(
         )
 
 
+@router.get(
+    "/history/export",
+    summary="Export Analysis History",
+    description="Stream every analysis matching the /history filters as JSONL, CSV or Parquet",
+    dependencies=[Depends(get_tenant)]
+)
+async def export_history(
+    fmt: Literal["jsonl", "csv", "parquet"] = Query("jsonl", alias="format"),
+    sentiment: str = None,
+    keyword: str = None,
+    search: str = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    include_archived: bool = False,
+    include_text: bool = Query(False, description="Include the decompressed original text")
+):
+    """
+    Bulk export for offline analytics, oldest first. Rows come from a
+    server-side cursor and are encoded batch by batch, so memory use does
+    not depend on the number of rows. Unlike /history there is no count
+    query and no pagination.
+    """
+    if fmt == "parquet" and not export.parquet_available():
+        raise HTTPException(status_code=400, detail="Parquet export requires pyarrow to be installed")
+    
+    chunks = export.export_stream(
+        fmt,
+        SessionLocal,
+        sentiment=sentiment,
+        keyword=keyword,
+        search=search,
+        start=start,
+        end=end,
+        include_text=include_text,
+        include_archived=include_archived,
+    )
+    return StreamingResponse(
+        chunks,
+        media_type=export.FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="text_analyses.{fmt}"'},
+    )
+
+
+@router.get(
+    "/history/similar",
+    summary="Find Similar Analyses",
+    description="Top-k analyses whose text is most similar (cosine) to the given text or analysis",
+    dependencies=[Depends(get_tenant)]
+)
+async def similar_analyses(
+    query_text: Optional[str] = Query(None, alias="text", min_length=3, max_length=10000),
+    analysis_id: Optional[int] = None,
+    k: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """Semantic search over analysis history using the embedding index"""
+    if not query_text and analysis_id is None:
+        raise HTTPException(status_code=400, detail="Provide either text or analysis_id")
+    
+    try:
+        exclude_hash = None
+        if analysis_id is not None:
+            exclude_hash = (
+                db.query(TextAnalysis.document_hash)
+                .filter(TextAnalysis.id == analysis_id)
+                .scalar()
+            )
+            if exclude_hash is None:
+                raise HTTPException(status_code=404, detail="Analysis not found")
+            query_text = document_store.load_text(db, exclude_hash) or ""
+        
+        query_vector = (await text_encoder.encode([query_text]))[0]
+        # Over-fetch so excluded/garbage-collected documents don't shrink the page
+        hits = [
+            (h, score) for h, score in vector_index.search(query_vector, k + 5)
+            if h != exclude_hash
+        ]
+        scores = dict(hits)
+        
+        rows = (
+            db.query(*HISTORY_COLUMNS, TextAnalysis.document_hash)
+            .filter(TextAnalysis.document_hash.in_(list(scores)))
+            .order_by(TextAnalysis.document_hash, TextAnalysis.created_at.desc())
+            .distinct(TextAnalysis.document_hash)
+            .all()
+        ) if scores else []
+        
+        results = [
+            {**dict(zip(HISTORY_FIELDS, row[:-1])), "similarity": round(scores[row[-1]], 4)}
+            for row in rows
+        ]
+        results.sort(key=lambda r: r["similarity"], reverse=True)
+        return ORJSONResponse({
+            "analyses": results[:k],
+            "k": k,
+            "indexed": len(vector_index),
+            "encoder": text_encoder.name
+        })
+    except HTTPException:
+        raise
+    except Exception as e:
+        log_error(e, "similar_analyses")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to search similar analyses: {str(e)}"
+        )
+
+
+def _merge_archived_history(query, db_total, skip, limit, sentiment, keyword, search, start, end):
+    """
+    Combine live rows with rows from archive files, newest first.
+    Archives only hold data older than every live partition, so live rows
+    always come first and archived rows continue the page after them.
+    """
+    rows = []
+    if skip < db_total:
+        rows = (
+            query.with_entities(*HISTORY_COLUMNS)
+            .order_by(TextAnalysis.created_at.desc())
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+
+    archived, archived_total, exact = archive.archived_page(
+        max(0, skip - db_total), limit - len(rows), start, end, sentiment, keyword, search
+    )
+    rows = list(rows) + [tuple(r.get(f) for f in HISTORY_FIELDS) for r in archived]
+    return rows, db_total + archived_total, exact
+
+
+@router.get(
+    "/jobs/{job_id}",
+    summary="Get Analysis Job",
+    description="Status and result of an analysis queued with POST /api/analyze?async=true",
+    dependencies=[Depends(get_tenant)]
+)
+async def get_job(job_id: int, db: Session = Depends(get_db)):
+    """Poll a queued analysis job"""
+    job = db.get(AnalysisJob, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return jobs.job_status(job)
+
+
+@router.get(
+    "/llm/providers",
+    summary="LLM Provider Stats",
+    description="Per-provider routing stats (EWMA latency, error rate, in-flight calls) and scheduler state",
+    dependencies=[Depends(require_admin)]
+)
+async def llm_provider_stats():
+    """Expose live stats for each configured LLM provider and the fair-share scheduler"""
+    return {"providers": llm_client.provider_stats(), "scheduler": llm_client.scheduler_stats()}
+
+
+@router.get(
+    "/llm/prompts",
+    summary="Prompt Template Usage",
+    description="Calls and prompt/cached/completion tokens per prompt template (this process)"
+)
+async def llm_prompt_stats():
+    """Expose per-template token usage"""
+    return {"templates": llm_client.prompt_stats()}
+
+
 @router.get(
     "/health",
     summary="Health Check",
@@ -0,0 +1,101 @@
+"""
+Admin-only profiling endpoints (mounted under /api/debug with require_admin)
+
+All state is per worker process: with several gunicorn workers each
+request reaches one of them, identified by `pid` in the responses.
+"""
+
+import asyncio
+import os
+import time
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from app.core.config import settings
+from app.lib.profiling import ProfilerBusy, loop_monitor, profiler, slow_requests
+from app.utils.logger import log_error
+
+router = APIRouter()
+
+
+@router.get(
+    "/profile",
+    response_class=PlainTextResponse,
+    summary="Sampling Profile",
+    description="Sample every thread's stack for N seconds and return collapsed stacks (flamegraph.pl / speedscope)"
+)
+async def sampling_profile(
+    seconds: float = Query(10.0, gt=0),
+    interval_ms: float = Query(None, gt=0, description="Sampling interval (default PROFILE_INTERVAL_MS)"),
+    include_idle: bool = Query(False, description="Keep threads parked in select/wait/queue.get")
+):
+    """Record a profile of this worker while it serves other traffic"""
+    if seconds > settings.PROFILE_MAX_SECONDS:
+        raise HTTPException(status_code=400, detail=f"seconds must be <= {settings.PROFILE_MAX_SECONDS:g}")
+    interval = (interval_ms or settings.PROFILE_INTERVAL_MS) / 1000.0
+    try:
+        # Sampling runs in a worker thread so the event loop keeps serving (and being sampled)
+        stacks = await asyncio.to_thread(profiler.run, seconds, interval, include_idle)
+    except ProfilerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        log_error(e, "sampling_profile")
+        raise HTTPException(status_code=500, detail=f"Profiling failed: {str(e)}")
+
+    filename = f"profile-{os.getpid()}-{int(time.time())}.collapsed"
+    return PlainTextResponse(
+        profiler.format(stacks),
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get(
+    "/loop-monitor",
+    summary="Event Loop Stalls",
+    description="Recent callbacks that blocked the event loop, with the blocking stack"
+)
+async def loop_monitor_events():
+    """Most recent stalls first"""
+    return {
+        "pid": os.getpid(),
+        "enabled": loop_monitor.enabled,
+        "threshold_ms": loop_monitor.threshold * 1000,
+        "events": list(reversed(loop_monitor.events)),
+    }
+
+
+@router.put(
+    "/loop-monitor",
+    summary="Configure Event Loop Stall Detection",
+    description="Report stalls longer than threshold_ms; 0 turns detection off"
+)
+async def configure_loop_monitor(threshold_ms: float = Query(..., ge=0)):
+    """Start, retune or stop the monitor on this worker's loop"""
+    loop_monitor.start(threshold_ms)
+    return {"pid": os.getpid(), "enabled": loop_monitor.enabled, "threshold_ms": threshold_ms}
+
+
+@router.get(
+    "/slow-requests",
+    summary="Slow Requests",
+    description="Recent requests over the threshold with their per-stage timing breakdown"
+)
+async def slow_request_log():
+    """Most recent slow requests first"""
+    return {
+        "pid": os.getpid(),
+        "threshold_ms": slow_requests.threshold_ms,
+        "requests": slow_requests.recent(),
+    }
+
+
+@router.put(
+    "/slow-requests",
+    summary="Configure Slow-Request Log",
+    description="Trace stages of requests and keep those slower than threshold_ms; 0 turns tracing off"
+)
+async def configure_slow_requests(threshold_ms: float = Query(..., ge=0)):
+    """Change the threshold on this worker"""
+    slow_requests.threshold_ms = threshold_ms
+    return {"pid": os.getpid(), "threshold_ms": threshold_ms}
@@ -0,0 +1,79 @@
+"""
+Analytics endpoints backed by pre-aggregated rollup tables
+"""
+
+from datetime import datetime
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.database.database import get_db
+from app.services import analytics
+from app.utils.logger import log_error
+
+router = APIRouter()
+
+
+@router.get(
+    "/sentiment",
+    summary="Sentiment Over Time",
+    description="Sentiment distribution per hour or day bucket (defaults to the last 30 days)"
+)
+async def sentiment_stats(
+    granularity: Literal["hour", "day"] = "day",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    db: Session = Depends(get_db)
+):
+    """Read sentiment counts from sentiment_rollups"""
+    try:
+        return {
+            "granularity": granularity,
+            "buckets": analytics.sentiment_over_time(db, granularity, start, end),
+        }
+    except Exception as e:
+        log_error(e, "sentiment_stats")
+        raise HTTPException(status_code=500, detail=f"Failed to fetch sentiment stats: {str(e)}")
+
+
+def _term_stats(kind: str, start, end, limit: int, per_day: bool, db: Session):
+    try:
+        if per_day:
+            return {"kind": kind, "days": analytics.top_terms_per_day(db, kind, start, end, limit)}
+        return {"kind": kind, "terms": analytics.top_terms(db, kind, start, end, limit)}
+    except Exception as e:
+        log_error(e, f"{kind}_stats")
+        raise HTTPException(status_code=500, detail=f"Failed to fetch {kind} stats: {str(e)}")
+
+
+@router.get(
+    "/topics",
+    summary="Top Topics",
+    description="Most frequent topics over a date range (defaults to the last 7 days)"
+)
+async def topic_stats(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    limit: int = 10,
+    per_day: bool = False,
+    db: Session = Depends(get_db)
+):
+    """Read topic frequencies from term_rollups"""
+    return _term_stats("topic", start, end, limit, per_day, db)
+
+
+@router.get(
+    "/keywords",
+    summary="Top Keywords",
+    description="Most frequent keywords over a date range (defaults to the last 7 days)"
+)
+async def keyword_stats(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    limit: int = 10,
+    per_day: bool = False,
+    db: Session = Depends(get_db)
+):
+    """Read keyword frequencies from term_rollups"""
+    return _term_stats("keyword", start, end, limit, per_day, db)
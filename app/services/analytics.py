@@ -0,0 +1,206 @@
+"""
+Analytics rollups - incremental sentiment/topic/keyword aggregates
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import func, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.database.models import SentimentRollup, TermRollup
+
+GRANULARITIES = ("hour", "day")
+TERM_KINDS = ("topic", "keyword")
+
+# Rebuild rollups from text_analyses (used by the backfill migration and
+# the periodic reconciliation job). Only buckets from the oldest live row
+# onwards are replaced, so counts for archived partitions survive retention.
+# Empty padding topics are skipped, and a term repeated within one analysis
+# counts once (as in record_analysis).
+REBUILD_SQL = [
+    """
+    DELETE FROM sentiment_rollups
+    WHERE bucket_start >= (SELECT date_trunc('day', min(created_at)) FROM text_analyses)
+    """,
+    """
+    DELETE FROM term_rollups
+    WHERE day >= (SELECT date_trunc('day', min(created_at)) FROM text_analyses)
+    """,
+    """
+    INSERT INTO sentiment_rollups (granularity, bucket_start, sentiment, count)
+    SELECT g.granularity, date_trunc(g.granularity, t.created_at), t.sentiment, count(*)
+    FROM text_analyses t
+    CROSS JOIN (VALUES ('hour'), ('day')) AS g(granularity)
+    WHERE t.created_at IS NOT NULL
+    GROUP BY 1, 2, 3
+    """,
+    """
+    INSERT INTO term_rollups (kind, day, term, count)
+    SELECT 'topic', date_trunc('day', t.created_at), left(trim(e.term), 200), count(DISTINCT t.id)
+    FROM text_analyses t
+    CROSS JOIN LATERAL json_array_elements_text(COALESCE(t.topics::json, '[]'::json)) AS e(term)
+    WHERE t.created_at IS NOT NULL AND trim(e.term) <> ''
+    GROUP BY 1, 2, 3
+    """,
+    """
+    INSERT INTO term_rollups (kind, day, term, count)
+    SELECT 'keyword', date_trunc('day', t.created_at), left(trim(e.term), 200), count(DISTINCT t.id)
+    FROM text_analyses t
+    CROSS JOIN LATERAL json_array_elements_text(COALESCE(t.keywords::json, '[]'::json)) AS e(term)
+    WHERE t.created_at IS NOT NULL AND trim(e.term) <> ''
+    GROUP BY 1, 2, 3
+    """,
+]
+
+
+def _clean_terms(terms: Optional[Iterable[Any]]) -> List[str]:
+    cleaned = {str(t).strip()[:200] for t in (terms or []) if str(t).strip()}
+    return sorted(cleaned)
+
+
+def record_analysis(db: Session, sentiment: str, topics: Optional[List[str]], keywords: Optional[List[str]]) -> None:
+    """
+    Add one analysis to the rollups inside the caller's transaction.
+    Buckets use now(), i.e. the same transaction timestamp as created_at.
+    """
+    sentiment_rows = [
+        {
+            "granularity": g,
+            "bucket_start": func.date_trunc(g, func.now()),
+            "sentiment": sentiment,
+            "count": 1,
+        }
+        for g in GRANULARITIES
+    ]
+    stmt = pg_insert(SentimentRollup).values(sentiment_rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["granularity", "bucket_start", "sentiment"],
+        set_={"count": SentimentRollup.count + stmt.excluded.count},
+    )
+    db.execute(stmt)
+
+    term_rows = [
+        {"kind": kind, "day": func.date_trunc("day", func.now()), "term": term, "count": 1}
+        for kind, terms in (("topic", topics), ("keyword", keywords))
+        for term in _clean_terms(terms)
+    ]
+    if term_rows:
+        stmt = pg_insert(TermRollup).values(term_rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["kind", "day", "term"],
+            set_={"count": TermRollup.count + stmt.excluded.count},
+        )
+        db.execute(stmt)
+
+
+def rebuild_rollups(db: Session) -> None:
+    """Recompute all rollups from text_analyses (periodic reconciliation)"""
+    for sql in REBUILD_SQL:
+        db.execute(text(sql))
+    db.commit()
+
+
+def sentiment_over_time(
+    db: Session,
+    granularity: str = "day",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> List[Dict[str, Any]]:
+    """Sentiment counts per bucket, oldest first"""
+    end = end or datetime.now(timezone.utc)
+    start = start or end - timedelta(days=30)
+    rows = (
+        db.query(SentimentRollup.bucket_start, SentimentRollup.sentiment, SentimentRollup.count)
+        .filter(
+            SentimentRollup.granularity == granularity,
+            SentimentRollup.bucket_start >= start,
+            SentimentRollup.bucket_start <= end,
+        )
+        .order_by(SentimentRollup.bucket_start)
+        .all()
+    )
+
+    buckets: Dict[datetime, Dict[str, Any]] = {}
+    for bucket_start, sentiment, count in rows:
+        entry = buckets.setdefault(
+            bucket_start,
+            {"bucket_start": bucket_start, "positive": 0, "neutral": 0, "negative": 0, "total": 0},
+        )
+        entry[sentiment] = entry.get(sentiment, 0) + count
+        entry["total"] += count
+    return list(buckets.values())
+
+
+def top_terms(
+    db: Session,
+    kind: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    limit: int = 10,
+) -> List[Dict[str, Any]]:
+    """Most frequent topics/keywords over a day range"""
+    end = end or datetime.now(timezone.utc)
+    start = start or end - timedelta(days=7)
+    total = func.sum(TermRollup.count).label("total")
+    rows = (
+        db.query(TermRollup.term, total)
+        .filter(
+            TermRollup.kind == kind,
+            TermRollup.day >= func.date_trunc("day", start),
+            TermRollup.day <= end,
+        )
+        .group_by(TermRollup.term)
+        .order_by(total.desc(), TermRollup.term)
+        .limit(limit)
+        .all()
+    )
+    return [{"term": term, "count": int(count)} for term, count in rows]
+
+
+def top_terms_per_day(
+    db: Session,
+    kind: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    limit: int = 5,
+) -> List[Dict[str, Any]]:
+    """Top `limit` topics/keywords for each day in the range"""
+    end = end or datetime.now(timezone.utc)
+    start = start or end - timedelta(days=7)
+    rank = func.row_number().over(
+        partition_by=TermRollup.day, order_by=(TermRollup.count.desc(), TermRollup.term)
+    ).label("rank")
+    ranked = (
+        db.query(TermRollup.day, TermRollup.term, TermRollup.count, rank)
+        .filter(
+            TermRollup.kind == kind,
+            TermRollup.day >= func.date_trunc("day", start),
+            TermRollup.day <= end,
+        )
+        .subquery()
+    )
+    rows = (
+        db.query(ranked.c.day, ranked.c.term, ranked.c.count)
+        .filter(ranked.c.rank <= limit)
+        .order_by(ranked.c.day, ranked.c.rank)
+        .all()
+    )
+
+    days: Dict[datetime, Dict[str, Any]] = {}
+    for day, term, count in rows:
+        days.setdefault(day, {"day": day, "terms": []})["terms"].append({"term": term, "count": count})
+    return list(days.values())
+
+
+if __name__ == "__main__":
+    # Periodic reconciliation entry point, e.g. from cron:
+    #   python -m app.services.analytics
+    from app.database.database import SessionLocal
+
+    session = SessionLocal()
+    try:
+        rebuild_rollups(session)
+    finally:
+        session.close()
@@ -0,0 +1,276 @@
+"""
+Tenant API keys and per-key usage accounting
+
+Usage:
+    python -m app.services.api_keys create NAME [--weight 2] [--priority bulk] [--admin]
+    python -m app.services.api_keys list
+    python -m app.services.api_keys revoke KEY_ID
+    python -m app.services.api_keys usage [--days 7]
+"""
+
+import argparse
+import hashlib
+import secrets
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.database.models import ApiKey, ApiKeyUsage
+from app.lib.tenancy import PRIORITIES, Tenant, TokenUsage
+
+KEY_PREFIX = "ta_"
+
+
+def generate_key() -> str:
+    return KEY_PREFIX + secrets.token_urlsafe(32)
+
+
+def hash_key(raw: str) -> str:
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _tenant(key: ApiKey) -> Tenant:
+    return Tenant(
+        key_id=key.id,
+        name=key.name,
+        weight=key.weight,
+        priority=key.priority,
+        is_admin=key.is_admin,
+    )
+
+
+class KeyCache:
+    """
+    Per-process TTL cache of key lookups so authentication does not hit
+    the database on every request. Misses (unknown or revoked keys) are
+    cached too; revocation therefore takes up to the TTL to apply.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: Dict[Any, Tuple[float, Optional[Tenant]]] = {}
+
+    def get(self, key: Any) -> Tuple[bool, Optional[Tenant]]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            return False, None
+        return True, entry[1]
+
+    def set(self, key: Any, tenant: Optional[Tenant]) -> None:
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            if len(self._entries) > 10000:
+                self._entries.clear()
+            self._entries[key] = (time.monotonic() + self.ttl, tenant)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+key_cache = KeyCache(settings.API_KEY_CACHE_TTL)
+
+
+def authenticate(db: Session, raw: str) -> Optional[Tenant]:
+    """Resolve a presented key to its tenant, or None if unknown or revoked"""
+    digest = hash_key(raw)
+    hit, tenant = key_cache.get(digest)
+    if hit:
+        return tenant
+    key = db.query(ApiKey).filter(ApiKey.key_hash == digest, ApiKey.active.is_(True)).first()
+    tenant = _tenant(key) if key is not None else None
+    key_cache.set(digest, tenant)
+    return tenant
+
+
+def tenant_for_key_id(db: Session, key_id: int) -> Optional[Tenant]:
+    """Tenant of a stored key id (job workers), revoked keys included"""
+    hit, tenant = key_cache.get(("id", key_id))
+    if hit:
+        return tenant
+    key = db.get(ApiKey, key_id)
+    tenant = _tenant(key) if key is not None else None
+    key_cache.set(("id", key_id), tenant)
+    return tenant
+
+
+def create_key(
+    db: Session,
+    name: str,
+    weight: float = 1.0,
+    priority: str = "interactive",
+    is_admin: bool = False,
+) -> Tuple[ApiKey, str]:
+    """Create and commit a key. The raw key is returned once and never stored."""
+    if priority not in PRIORITIES:
+        raise ValueError(f"priority must be one of {PRIORITIES}")
+    if weight <= 0:
+        raise ValueError("weight must be positive")
+    raw = generate_key()
+    key = ApiKey(
+        name=name,
+        key_hash=hash_key(raw),
+        key_prefix=raw[:10],
+        weight=weight,
+        priority=priority,
+        is_admin=is_admin,
+        active=True,
+    )
+    db.add(key)
+    db.commit()
+    db.refresh(key)
+    return key, raw
+
+
+def revoke_key(db: Session, key_id: int) -> bool:
+    key = db.get(ApiKey, key_id)
+    if key is None or not key.active:
+        return False
+    key.active = False
+    key.revoked_at = datetime.now(timezone.utc)
+    db.commit()
+    key_cache.invalidate()
+    return True
+
+
+def list_keys(db: Session) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": k.id,
+            "name": k.name,
+            "prefix": k.key_prefix,
+            "weight": k.weight,
+            "priority": k.priority,
+            "is_admin": k.is_admin,
+            "active": k.active,
+            "created_at": k.created_at,
+            "revoked_at": k.revoked_at,
+        }
+        for k in db.query(ApiKey).order_by(ApiKey.id).all()
+    ]
+
+
+def record_usage(db: Session, tenant: Tenant, usage: TokenUsage, failed: bool = False) -> None:
+    """
+    Add one request and its LLM usage to today's counters inside the
+    caller's transaction. Anonymous requests are not accounted.
+    """
+    if tenant.key_id is None:
+        return
+    stmt = pg_insert(ApiKeyUsage).values(
+        api_key_id=tenant.key_id,
+        day=func.date_trunc("day", func.now()),
+        requests=1,
+        errors=1 if failed else 0,
+        llm_calls=usage.calls,
+        prompt_tokens=usage.prompt_tokens,
+        completion_tokens=usage.completion_tokens,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["api_key_id", "day"],
+        set_={
+            "requests": ApiKeyUsage.requests + stmt.excluded.requests,
+            "errors": ApiKeyUsage.errors + stmt.excluded.errors,
+            "llm_calls": ApiKeyUsage.llm_calls + stmt.excluded.llm_calls,
+            "prompt_tokens": ApiKeyUsage.prompt_tokens + stmt.excluded.prompt_tokens,
+            "completion_tokens": ApiKeyUsage.completion_tokens + stmt.excluded.completion_tokens,
+        },
+    )
+    db.execute(stmt)
+
+
+def usage_report(
+    db: Session,
+    key_id: Optional[int] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> List[Dict[str, Any]]:
+    """Per-key totals and daily breakdown over a day range (default: last 30 days)"""
+    end = end or datetime.now(timezone.utc)
+    start = start or end - timedelta(days=30)
+    query = (
+        db.query(
+            ApiKey.id,
+            ApiKey.name,
+            ApiKey.priority,
+            ApiKey.weight,
+            ApiKeyUsage.day,
+            ApiKeyUsage.requests,
+            ApiKeyUsage.errors,
+            ApiKeyUsage.llm_calls,
+            ApiKeyUsage.prompt_tokens,
+            ApiKeyUsage.completion_tokens,
+        )
+        .join(ApiKeyUsage, ApiKeyUsage.api_key_id == ApiKey.id)
+        .filter(ApiKeyUsage.day >= func.date_trunc("day", start), ApiKeyUsage.day <= end)
+    )
+    if key_id is not None:
+        query = query.filter(ApiKey.id == key_id)
+
+    counters = ("requests", "errors", "llm_calls", "prompt_tokens", "completion_tokens")
+    keys: Dict[int, Dict[str, Any]] = {}
+    for row in query.order_by(ApiKey.id, ApiKeyUsage.day).all():
+        entry = keys.setdefault(
+            row.id,
+            {
+                "key_id": row.id,
+                "name": row.name,
+                "priority": row.priority,
+                "weight": row.weight,
+                **{c: 0 for c in counters},
+                "days": [],
+            },
+        )
+        day = {"day": row.day}
+        for c in counters:
+            value = int(getattr(row, c))
+            day[c] = value
+            entry[c] += value
+        entry["days"].append(day)
+    return list(keys.values())
+
+
+if __name__ == "__main__":
+    from app.database.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    create = commands.add_parser("create")
+    create.add_argument("name")
+    create.add_argument("--weight", type=float, default=1.0)
+    create.add_argument("--priority", choices=PRIORITIES, default="interactive")
+    create.add_argument("--admin", action="store_true")
+    commands.add_parser("list")
+    revoke = commands.add_parser("revoke")
+    revoke.add_argument("key_id", type=int)
+    usage = commands.add_parser("usage")
+    usage.add_argument("--days", type=int, default=7)
+    args = parser.parse_args()
+
+    session = SessionLocal()
+    try:
+        if args.command == "create":
+            key, raw = create_key(session, args.name, args.weight, args.priority, args.admin)
+            print(f"Created key {key.id} ({key.name}): {raw}")
+            print("Store it now; only its hash is kept.")
+        elif args.command == "list":
+            for k in list_keys(session):
+                print(f"{k['id']:>4}  {k['prefix']}...  {k['name']:<24} weight={k['weight']:<5} "
+                      f"{k['priority']:<11} {'admin ' if k['is_admin'] else ''}{'active' if k['active'] else 'revoked'}")
+        elif args.command == "revoke":
+            print("Revoked" if revoke_key(session, args.key_id) else "No active key with that id")
+        else:
+            start = datetime.now(timezone.utc) - timedelta(days=args.days)
+            for entry in usage_report(session, start=start):
+                print(f"{entry['key_id']:>4}  {entry['name']:<24} requests={entry['requests']} errors={entry['errors']} "
+                      f"prompt_tokens={entry['prompt_tokens']} completion_tokens={entry['completion_tokens']}")
+    finally:
+        session.close()
@@ -0,0 +1,272 @@
+"""
+Compressed archives of expired text_analyses partitions (JSONL.zst / Parquet)
+"""
+
+import os
+import re
+from collections import deque
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import orjson
+import zstandard
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.core.config import settings
+from app.services.documents import document_store
+
+ARCHIVE_COLUMNS = (
+    "id",
+    "original_text",
+    "summary",
+    "title",
+    "topics",
+    "sentiment",
+    "keywords",
+    "processing_time",
+    "confidence_score",
+    "created_at",
+    "updated_at",
+)
+FILE_PATTERN = re.compile(r"^text_analyses_(\d{4})_(\d{2})\.(jsonl\.zst|parquet)$")
+
+
+def archive_dir() -> Path:
+    return Path(settings.ARCHIVE_DIR)
+
+
+def archive_path(month: date, fmt: Optional[str] = None) -> Path:
+    fmt = fmt or settings.ARCHIVE_FORMAT
+    return archive_dir() / f"text_analyses_{month.year:04d}_{month.month:02d}.{fmt}"
+
+
+def archive_partition(conn: Connection, partition: str, month: date) -> Path:
+    """
+    Stream every row of `partition` into a compressed archive file.
+    Written to a temp file and renamed so a crash never leaves a partial archive.
+    """
+    path = archive_path(month)
+    if path.exists():
+        # e.g. late rows for an already archived month; never overwrite an archive
+        raise FileExistsError(f"Archive {path} already exists; move it aside to re-archive {partition}")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+
+    # Texts live compressed in `documents`; archives store them decompressed
+    selected = ", ".join("d.content, d.dict_id" if c == "original_text" else f"t.{c}" for c in ARCHIVE_COLUMNS)
+    result = conn.execution_options(stream_results=True, yield_per=settings.ARCHIVE_BATCH_SIZE).execute(
+        text(
+            f'SELECT {selected} FROM "{partition}" t '
+            f"LEFT JOIN documents d ON d.hash = t.document_hash ORDER BY t.created_at, t.id"
+        )
+    )
+
+    rows = _inflate_documents(conn, result)
+    if settings.ARCHIVE_FORMAT == "parquet":
+        _write_parquet(rows, tmp)
+    else:
+        _write_jsonl_zst(rows, tmp)
+
+    os.replace(tmp, path)
+    return path
+
+
+def _inflate_documents(conn: Connection, result) -> Iterator[List[tuple]]:
+    """Yield row batches with (content, dict_id) replaced by the decompressed text"""
+    from sqlalchemy.orm import Session
+
+    session = Session(bind=conn)
+    for batch in result.partitions():
+        yield [
+            (row[0], document_store.decompress(row[1], row[2], session) if row[1] is not None else None, *row[3:])
+            for row in batch
+        ]
+
+
+def _write_jsonl_zst(batches: Iterable[List[tuple]], path: Path) -> None:
+    compressor = zstandard.ZstdCompressor(level=settings.ARCHIVE_ZSTD_LEVEL)
+    with open(path, "wb") as raw, compressor.stream_writer(raw) as out:
+        for batch in batches:
+            out.write(b"".join(orjson.dumps(dict(zip(ARCHIVE_COLUMNS, row))) + b"\n" for row in batch))
+
+
+def _write_parquet(batches: Iterable[List[tuple]], path: Path) -> None:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("ARCHIVE_FORMAT=parquet requires pyarrow to be installed")
+
+    schema = pa.schema(
+        [
+            ("id", pa.int64()),
+            ("original_text", pa.string()),
+            ("summary", pa.string()),
+            ("title", pa.string()),
+            ("topics", pa.list_(pa.string())),
+            ("sentiment", pa.string()),
+            ("keywords", pa.list_(pa.string())),
+            ("processing_time", pa.float64()),
+            ("confidence_score", pa.float64()),
+            ("created_at", pa.timestamp("us", tz="UTC")),
+            ("updated_at", pa.timestamp("us", tz="UTC")),
+        ]
+    )
+    with pq.ParquetWriter(path, schema, compression="zstd") as writer:
+        for batch in batches:
+            columns = list(zip(*batch))
+            writer.write_batch(pa.record_batch([list(c) for c in columns], schema=schema))
+
+
+def archived_months() -> List[Tuple[date, Path]]:
+    """(month, path) of every archive file on disk, oldest first"""
+    found = []
+    if not archive_dir().is_dir():
+        return found
+    for entry in archive_dir().iterdir():
+        m = FILE_PATTERN.match(entry.name)
+        if m:
+            found.append((date(int(m.group(1)), int(m.group(2)), 1), entry))
+    return sorted(found)
+
+
+def _read_file(path: Path) -> Iterator[Dict[str, Any]]:
+    if path.name.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=settings.ARCHIVE_BATCH_SIZE):
+            yield from batch.to_pylist()
+        return
+
+    decompressor = zstandard.ZstdDecompressor()
+    with open(path, "rb") as raw, decompressor.stream_reader(raw) as reader:
+        buffer = b""
+        while True:
+            chunk = reader.read(1 << 20)
+            if not chunk:
+                break
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line:
+                    yield _decode(line)
+        if buffer.strip():
+            yield _decode(buffer)
+
+
+def _decode(line: bytes) -> Dict[str, Any]:
+    row = orjson.loads(line)
+    for key in ("created_at", "updated_at"):
+        if row.get(key):
+            row[key] = datetime.fromisoformat(row[key])
+    return row
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _months_in_range(start: Optional[datetime], end: Optional[datetime]) -> List[Tuple[date, Path]]:
+    return [
+        (month, path)
+        for month, path in archived_months()
+        if (start is None or (month.year, month.month) >= (start.year, start.month))
+        and (end is None or (month.year, month.month) <= (end.year, end.month))
+    ]
+
+
+def _rows_in_range(path: Path, start: Optional[datetime], end: Optional[datetime]) -> Iterator[Dict[str, Any]]:
+    for row in _read_file(path):
+        created = row.get("created_at")
+        if start is not None and created is not None and created < start:
+            continue
+        if end is not None and created is not None and created > end:
+            continue
+        yield row
+
+
+def iter_archived_rows(start: Optional[datetime] = None, end: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+    """Rows from archive files overlapping [start, end], in file order"""
+    start, end = _as_utc(start), _as_utc(end)
+    for _, path in _months_in_range(start, end):
+        yield from _rows_in_range(path, start, end)
+
+
+# Matching-row counts per (archive file, filters); archive files never change
+_match_counts: Dict[tuple, int] = {}
+_MATCH_COUNTS_MAX = 1024
+
+
+def archived_page(
+    skip: int,
+    limit: int,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    sentiment: Optional[str] = None,
+    keyword: Optional[str] = None,
+    search: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], int, bool]:
+    """
+    One newest-first page of archived rows matching the history filters.
+
+    Files are walked newest month first and the walk stops once the page
+    is full, keeping at most skip + limit rows per file in memory. Returns
+    (rows, total, exact): total counts matches in the files read plus
+    cached counts; exact is False when an unread file's count is unknown.
+    """
+    start, end = _as_utc(start), _as_utc(end)
+    page: List[Dict[str, Any]] = []
+    total, exact = 0, True
+    for month, path in reversed(_months_in_range(start, end)):
+        stat = path.stat()
+        key = (str(path), stat.st_mtime_ns, stat.st_size, start, end, sentiment, keyword, search)
+        wanted = skip + limit - total
+        if wanted <= 0:
+            cached = _match_counts.get(key)
+            if cached is None:
+                exact = False
+            else:
+                total += cached
+            continue
+
+        # Files are sorted oldest first: keep the newest `wanted` matches
+        newest: Deque[Dict[str, Any]] = deque(maxlen=wanted)
+        count = 0
+        for row in _rows_in_range(path, start, end):
+            if matches_history_filters(row, sentiment, keyword, search):
+                newest.append(row)
+                count += 1
+        for offset, row in enumerate(reversed(newest)):
+            if skip <= total + offset < skip + limit:
+                page.append(row)
+        total += count
+        if len(_match_counts) >= _MATCH_COUNTS_MAX:
+            _match_counts.clear()
+        _match_counts[key] = count
+    return page, total, exact
+
+
+def matches_history_filters(
+    row: Dict[str, Any],
+    sentiment: Optional[str] = None,
+    keyword: Optional[str] = None,
+    search: Optional[str] = None,
+) -> bool:
+    """Python equivalent of the /api/history SQL filters"""
+    if sentiment and sentiment.lower() in ("positive", "negative", "neutral"):
+        if row.get("sentiment") != sentiment.lower():
+            return False
+    if keyword:
+        needle = keyword.lower()
+        if not any(needle in str(k).lower() for k in (row.get("keywords") or [])):
+            return False
+    if search:
+        needle = search.lower()
+        haystacks = (row.get("original_text"), row.get("summary"), row.get("title"))
+        if not any(h and needle in h.lower() for h in haystacks):
+            return False
+    return True
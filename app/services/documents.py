@@ -0,0 +1,122 @@
+"""
+Content-addressed, zstd-compressed storage for analyzed texts
+"""
+
+import hashlib
+import threading
+from typing import Dict, Optional, Tuple
+
+import zstandard
+from sqlalchemy import func, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.database.models import Document, ZstdDictionary
+
+
+def hash_text(value: str) -> str:
+    """SHA-256 hex digest used as the document key"""
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+class DocumentStore:
+    """Stores each distinct text once, compressed, keyed by its hash"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._dictionaries: Dict[int, zstandard.ZstdCompressionDict] = {}
+        self._active_dict_id: Optional[int] = None
+        self._dicts_loaded = False
+
+    def compress(self, value: str, db: Optional[Session] = None) -> Tuple[bytes, Optional[int]]:
+        """Compress with the active trained dictionary when one is available"""
+        if db is not None and settings.DOCUMENT_ZSTD_USE_DICTIONARY:
+            self._load_dictionaries(db)
+        dict_id = self._active_dict_id if settings.DOCUMENT_ZSTD_USE_DICTIONARY else None
+        params = {"level": settings.DOCUMENT_ZSTD_LEVEL}
+        if dict_id is not None:
+            params["dict_data"] = self._dictionaries[dict_id]
+        return zstandard.ZstdCompressor(**params).compress(value.encode("utf-8")), dict_id
+
+    def decompress(self, content: bytes, dict_id: Optional[int] = None, db: Optional[Session] = None) -> str:
+        if dict_id is None:
+            return zstandard.ZstdDecompressor().decompress(content).decode("utf-8")
+        if dict_id not in self._dictionaries and db is not None:
+            self._load_dictionaries(db, force=True)
+        return zstandard.ZstdDecompressor(dict_data=self._dictionaries[dict_id]).decompress(content).decode("utf-8")
+
+    def get_or_create(self, db: Session, value: str) -> str:
+        """
+        Ensure a document exists for `value` and return its hash. Runs in the
+        caller's transaction; duplicates are a no-op upsert that writes nothing.
+        """
+        digest = hash_text(value)
+
+        content, dict_id = self.compress(value, db)
+        stmt = pg_insert(Document).values(
+            hash=digest,
+            content=content,
+            dict_id=dict_id,
+            size=len(value),
+            search_vector=func.to_tsvector("simple", value),
+        ).on_conflict_do_nothing(index_elements=["hash"])
+        db.execute(stmt)
+        return digest
+
+    def load_text(self, db: Session, digest: str) -> Optional[str]:
+        row = db.query(Document.content, Document.dict_id).filter(Document.hash == digest).first()
+        if row is None:
+            return None
+        return self.decompress(row.content, row.dict_id, db)
+
+    def train_dictionary(self, db: Session, samples: int = 5000, dict_size: int = 112_640) -> int:
+        """Train a zstd dictionary from stored documents and make it active"""
+        rows = db.query(Document.content, Document.dict_id).order_by(func.random()).limit(samples).all()
+        texts = [self.decompress(r.content, r.dict_id, db).encode("utf-8") for r in rows]
+        if len(texts) < 10:
+            raise RuntimeError("Not enough documents to train a dictionary")
+
+        trained = zstandard.train_dictionary(dict_size, texts)
+        record = ZstdDictionary(id=trained.dict_id(), data=trained.as_bytes())
+        db.merge(record)
+        db.commit()
+        self._load_dictionaries(db, force=True)
+        return record.id
+
+    def _load_dictionaries(self, db: Session, force: bool = False) -> None:
+        if self._dicts_loaded and not force:
+            return
+        with self._lock:
+            rows = db.query(ZstdDictionary.id, ZstdDictionary.data).order_by(ZstdDictionary.created_at).all()
+            self._dictionaries = {r.id: zstandard.ZstdCompressionDict(r.data) for r in rows}
+            self._active_dict_id = rows[-1].id if rows else None
+            self._dicts_loaded = True
+
+
+def garbage_collect(db: Session) -> int:
+    """Delete documents no longer referenced by any analysis"""
+    result = db.execute(
+        text(
+            "DELETE FROM documents d WHERE NOT EXISTS "
+            "(SELECT 1 FROM text_analyses t WHERE t.document_hash = d.hash)"
+        )
+    )
+    db.commit()
+    return result.rowcount
+
+
+# Global instance
+document_store = DocumentStore()
+
+
+if __name__ == "__main__":
+    # Train and activate a compression dictionary from stored documents:
+    #   python -m app.services.documents
+    from app.database.database import SessionLocal
+
+    session = SessionLocal()
+    try:
+        print(f"Trained dictionary {document_store.train_dictionary(session)}")
+    finally:
+        session.close()
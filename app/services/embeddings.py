@@ -0,0 +1,180 @@
+"""
+Background embedding pipeline and flat cosine index for similarity search
+
+Usage (background embedder):
+    python -m app.services.embeddings
+"""
+
+import asyncio
+import os
+import threading
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.database.models import DocumentEmbedding
+from app.lib.embeddings import TextEncoder, text_encoder
+from app.services.documents import document_store
+from app.utils.logger import log_error
+
+PENDING_SQL = text(
+    """
+    SELECT d.hash, d.content, d.dict_id
+    FROM documents d
+    LEFT JOIN document_embeddings e ON e.document_hash = d.hash AND e.encoder = :encoder
+    WHERE e.document_hash IS NULL
+    LIMIT :limit
+    """
+)
+
+
+class VectorIndex:
+    """
+    Exact (flat) cosine index persisted as two .npy files: an (n, dim)
+    float32 matrix and the matching document hashes. Files are memory-mapped
+    read-only, so every worker process shares one copy via the page cache,
+    and reloaded when the embedder replaces them.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.vectors_path = Path(f"{path}.vectors.npy")
+        self.keys_path = Path(f"{path}.keys.npy")
+        self._lock = threading.Lock()
+        self._vectors: Optional[np.ndarray] = None
+        self._keys: Optional[np.ndarray] = None
+        self._version: Optional[Tuple[int, int]] = None
+
+    def _maybe_reload(self) -> None:
+        try:
+            stat = self.keys_path.stat()
+        except FileNotFoundError:
+            return
+        version = (stat.st_mtime_ns, stat.st_size)
+        if version == self._version:
+            return
+        with self._lock:
+            if version != self._version:
+                self._vectors = np.load(self.vectors_path, mmap_mode="r")
+                self._keys = np.load(self.keys_path, mmap_mode="r")
+                self._version = version
+
+    def __len__(self) -> int:
+        self._maybe_reload()
+        return 0 if self._keys is None else len(self._keys)
+
+    def search(self, query: np.ndarray, k: int) -> List[Tuple[str, float]]:
+        """Top-k (document_hash, cosine similarity) for a normalized query vector"""
+        self._maybe_reload()
+        if self._vectors is None or not len(self._keys):
+            return []
+        scores = self._vectors @ query.astype(np.float32)
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self._keys[i].decode("ascii"), float(scores[i])) for i in top]
+
+    def append(self, keys: List[str], vectors: np.ndarray) -> None:
+        """Add vectors and atomically replace the index files"""
+        self._maybe_reload()
+        if self._vectors is not None and len(self._keys):
+            existing = set(self._keys.tolist())
+            fresh = [i for i, k in enumerate(keys) if k.encode("ascii") not in existing]
+            all_keys = np.concatenate([self._keys, np.array(keys, dtype="S64")[fresh]])
+            all_vectors = np.concatenate([self._vectors, vectors[fresh]])
+        else:
+            all_keys = np.array(keys, dtype="S64")
+            all_vectors = vectors
+        self._write(all_keys, all_vectors.astype(np.float32, copy=False))
+
+    def rebuild(self, keys: List[str], vectors: np.ndarray) -> None:
+        self._write(np.array(keys, dtype="S64"), vectors.astype(np.float32, copy=False))
+
+    def _write(self, keys: np.ndarray, vectors: np.ndarray) -> None:
+        self.vectors_path.parent.mkdir(parents=True, exist_ok=True)
+        # Vectors first, keys last: readers reload when the keys file changes
+        for path, array in ((self.vectors_path, vectors), (self.keys_path, keys)):
+            tmp = path.with_name(path.name + ".tmp")
+            with open(tmp, "wb") as f:
+                np.save(f, array)
+            os.replace(tmp, path)
+
+
+def _encode_vectors(vectors: np.ndarray) -> List[bytes]:
+    return [row.tobytes() for row in vectors.astype(np.float32, copy=False)]
+
+
+async def embed_pending(db: Session, encoder: TextEncoder, index: VectorIndex, batch_size: int) -> int:
+    """Embed one batch of documents that have no vector yet. Returns the batch size."""
+    rows = db.execute(PENDING_SQL, {"encoder": encoder.name, "limit": batch_size}).all()
+    if not rows:
+        return 0
+
+    hashes = [r.hash for r in rows]
+    texts = [document_store.decompress(r.content, r.dict_id, db) for r in rows]
+    vectors = await encoder.encode(texts)
+
+    stmt = pg_insert(DocumentEmbedding).values(
+        [
+            {"document_hash": h, "encoder": encoder.name, "dim": encoder.dim, "vector": v}
+            for h, v in zip(hashes, _encode_vectors(vectors))
+        ]
+    ).on_conflict_do_nothing(index_elements=["document_hash", "encoder"])
+    db.execute(stmt)
+    db.commit()
+
+    index.append(hashes, vectors)
+    return len(rows)
+
+
+def rebuild_index(db: Session, encoder: TextEncoder, index: VectorIndex) -> int:
+    """Recreate the index file from the vectors stored in Postgres"""
+    rows = (
+        db.query(DocumentEmbedding.document_hash, DocumentEmbedding.vector)
+        .filter(DocumentEmbedding.encoder == encoder.name)
+        .yield_per(10000)
+    )
+    keys: List[str] = []
+    chunks: List[np.ndarray] = []
+    for document_hash, vector in rows:
+        keys.append(document_hash)
+        chunks.append(np.frombuffer(vector, dtype=np.float32))
+    vectors = np.vstack(chunks) if chunks else np.zeros((0, encoder.dim), dtype=np.float32)
+    index.rebuild(keys, vectors)
+    return len(keys)
+
+
+async def run_embedder(stop: Optional[asyncio.Event] = None) -> None:
+    """Keep embedding new documents in batches, off the request path"""
+    from app.database.database import SessionLocal
+
+    stop = stop or asyncio.Event()
+    db = SessionLocal()
+    try:
+        rebuild_index(db, text_encoder, vector_index)
+        while not stop.is_set():
+            try:
+                done = await embed_pending(db, text_encoder, vector_index, settings.EMBEDDING_BATCH_SIZE)
+            except Exception as e:
+                db.rollback()
+                log_error(e, "embedder")
+                done = 0
+            if done < settings.EMBEDDING_BATCH_SIZE:
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=settings.EMBEDDING_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+    finally:
+        db.close()
+
+
+# Global instance
+vector_index = VectorIndex(settings.EMBEDDING_INDEX_PATH)
+
+
+if __name__ == "__main__":
+    asyncio.run(run_embedder())
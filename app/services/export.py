@@ -0,0 +1,260 @@
+"""
+Streamed bulk export of analysis history as JSONL, CSV or Parquet
+
+Rows are read through a server-side cursor (Query.yield_per, i.e.
+stream_results) and written one batch at a time, so memory stays
+constant however many rows match. Columns match the partition archives.
+
+Usage:
+    python -m app.services.export --format parquet --output history.parquet \
+        [--sentiment positive] [--keyword ai] [--search privacy] \
+        [--start 2025-01-01] [--end 2025-06-30] [--include-text] [--include-archived]
+"""
+
+import argparse
+import csv
+import io
+import sys
+from datetime import datetime
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import orjson
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.database.models import Document, TextAnalysis
+from app.services import archive
+from app.services.documents import document_store
+from app.services.history import filter_history
+from app.utils.logger import log_error
+
+FORMATS: Dict[str, str] = {
+    "jsonl": "application/x-ndjson",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def export_columns(include_text: bool) -> Sequence[str]:
+    return tuple(c for c in archive.ARCHIVE_COLUMNS if include_text or c != "original_text")
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def iter_batches(
+    db: Session,
+    sentiment: Optional[str] = None,
+    keyword: Optional[str] = None,
+    search: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    include_text: bool = False,
+    include_archived: bool = False,
+    batch_size: Optional[int] = None,
+) -> Iterator[List[tuple]]:
+    """
+    Matching rows oldest first, as tuples in export_columns() order.
+    Archived rows (all older than any live partition) come first.
+    """
+    batch_size = batch_size or settings.EXPORT_BATCH_SIZE
+    columns = export_columns(include_text)
+
+    if include_archived:
+        rows = (
+            tuple(r.get(c) for c in columns)
+            for r in archive.iter_archived_rows(start, end)
+            if archive.matches_history_filters(r, sentiment, keyword, search)
+        )
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            yield batch
+
+    selected = [getattr(TextAnalysis, c) for c in columns if c != "original_text"]
+    query = filter_history(db.query(TextAnalysis), sentiment, keyword, search, start, end)
+    if include_text:
+        query = query.outerjoin(Document, Document.hash == TextAnalysis.document_hash)
+        selected += [Document.content, Document.dict_id]
+    query = (
+        query.with_entities(*selected)
+        .order_by(TextAnalysis.created_at, TextAnalysis.id)
+        .yield_per(batch_size)
+    )
+
+    batch: List[tuple] = []
+    for row in query:
+        if include_text:
+            content, dict_id = row[-2], row[-1]
+            text = document_store.decompress(content, dict_id, db) if content is not None else None
+            row = (row[0], text, *row[1:-2])
+        batch.append(tuple(row))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def write_jsonl(batches: Iterable[List[tuple]], columns: Sequence[str]) -> Iterator[bytes]:
+    for batch in batches:
+        yield b"".join(orjson.dumps(dict(zip(columns, row))) + b"\n" for row in batch)
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, (list, dict)):
+        return orjson.dumps(value).decode("utf-8")
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def write_csv(batches: Iterable[List[tuple]], columns: Sequence[str]) -> Iterator[bytes]:
+    """CSV with a header row; list columns (topics, keywords) are JSON-encoded"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for batch in batches:
+        writer.writerows([_csv_value(v) for v in row] for row in batch)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+class _ChunkSink:
+    """Write-only file object that hands what pyarrow wrote back to the generator"""
+
+    def __init__(self) -> None:
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def write_parquet(batches: Iterable[List[tuple]], columns: Sequence[str]) -> Iterator[bytes]:
+    """One row group per batch, each emitted as soon as it is written"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet export requires pyarrow to be installed")
+
+    types = {
+        "id": pa.int64(),
+        "original_text": pa.string(),
+        "summary": pa.string(),
+        "title": pa.string(),
+        "topics": pa.list_(pa.string()),
+        "sentiment": pa.string(),
+        "keywords": pa.list_(pa.string()),
+        "processing_time": pa.float64(),
+        "confidence_score": pa.float64(),
+        "created_at": pa.timestamp("us", tz="UTC"),
+        "updated_at": pa.timestamp("us", tz="UTC"),
+    }
+    schema = pa.schema([(c, types[c]) for c in columns])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    try:
+        for batch in batches:
+            arrays = [list(c) for c in zip(*batch)]
+            writer.write_batch(pa.record_batch(arrays, schema=schema))
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+WRITERS: Dict[str, Callable[[Iterable[List[tuple]], Sequence[str]], Iterator[bytes]]] = {
+    "jsonl": write_jsonl,
+    "csv": write_csv,
+    "parquet": write_parquet,
+}
+
+
+def export_stream(fmt: str, session_factory: Callable[[], Session], **filters: Any) -> Iterator[bytes]:
+    """Encoded export chunks; owns its session for as long as the stream is consumed"""
+    db = session_factory()
+    try:
+        columns = export_columns(filters.get("include_text", False))
+        yield from WRITERS[fmt](iter_batches(db, **filters), columns)
+    except Exception as e:
+        # Headers are already sent; the client sees a truncated download
+        log_error(e, "export_history")
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    from app.database.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--format", choices=sorted(FORMATS), default="jsonl")
+    parser.add_argument("--output", default="-", help="file path, or - for stdout")
+    parser.add_argument("--sentiment")
+    parser.add_argument("--keyword")
+    parser.add_argument("--search")
+    parser.add_argument("--start", type=datetime.fromisoformat)
+    parser.add_argument("--end", type=datetime.fromisoformat)
+    parser.add_argument("--include-text", action="store_true")
+    parser.add_argument("--include-archived", action="store_true")
+    parser.add_argument("--batch-size", type=int, default=settings.EXPORT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    chunks = export_stream(
+        args.format,
+        SessionLocal,
+        sentiment=args.sentiment,
+        keyword=args.keyword,
+        search=args.search,
+        start=args.start,
+        end=args.end,
+        include_text=args.include_text,
+        include_archived=args.include_archived,
+        batch_size=args.batch_size,
+    )
+    out = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+    try:
+        for chunk in chunks:
+            out.write(chunk)
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
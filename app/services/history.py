@@ -0,0 +1,51 @@
+"""
+Shared filters for analysis history queries (/api/history and exports)
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import func, or_, select, text
+from sqlalchemy.orm import Query
+
+from app.database.models import Document, TextAnalysis
+
+
+def filter_history(
+    query: Query,
+    sentiment: Optional[str] = None,
+    keyword: Optional[str] = None,
+    search: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> Query:
+    """Apply the /api/history filters to a query over TextAnalysis"""
+    if sentiment and sentiment.lower() in ['positive', 'negative', 'neutral']:
+        query = query.filter(TextAnalysis.sentiment == sentiment.lower())
+
+    if keyword:
+        # Search for keyword in the keywords JSON array using raw SQL
+        keyword_lower = keyword.lower()
+        query = query.filter(
+            text("keywords::text ILIKE :keyword")
+        ).params(keyword=f"%{keyword_lower}%")
+
+    if search:
+        # Full-text match on the stored document, substring match on summary/title
+        search_term = f"%{search.lower()}%"
+        matching_documents = select(Document.hash).where(
+            Document.search_vector.op("@@")(func.plainto_tsquery("simple", search))
+        )
+        query = query.filter(
+            or_(
+                TextAnalysis.document_hash.in_(matching_documents),
+                TextAnalysis.summary.ilike(search_term),
+                TextAnalysis.title.ilike(search_term)
+            )
+        )
+
+    if start:
+        query = query.filter(TextAnalysis.created_at >= start)
+    if end:
+        query = query.filter(TextAnalysis.created_at <= end)
+    return query
@@ -0,0 +1,177 @@
+"""
+Worker processes that consume the analysis job queue
+
+Usage:
+    python -m app.services.job_worker [--processes 2] [--concurrency 8]
+
+Workers only need DATABASE_URL and LLM credentials, so they can run on any
+node; SKIP LOCKED keeps them from claiming the same job.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+from typing import Any, Dict, Optional
+
+import httpx
+
+from app.core.config import settings
+from app.database.database import SessionLocal
+from app.lib.tenancy import ANONYMOUS, Tenant, TokenUsage, tenant_scope
+from app.models.schemas import TextAnalysisRequest
+from app.services import api_keys, jobs
+from app.services.storage import store_analysis
+from app.services.text_analyzer import text_analyzer_service
+from app.utils.deadline import run_with_deadline
+from app.utils.logger import log_error
+
+
+class JobWorker:
+    """Polls for queued jobs and runs up to `concurrency` of them at once"""
+
+    def __init__(self, concurrency: int) -> None:
+        self.concurrency = concurrency
+        self.name = f"{socket.gethostname()}:{os.getpid()}"
+        self._stopping = asyncio.Event()
+        self._slots = asyncio.Semaphore(concurrency)
+        self._tasks: set = set()
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    async def run(self) -> None:
+        async with httpx.AsyncClient(timeout=settings.JOB_WEBHOOK_TIMEOUT) as webhooks:
+            self._webhooks = webhooks
+            while not self._stopping.is_set():
+                free = self.concurrency - len(self._tasks)
+                claimed = await asyncio.to_thread(self._claim, free) if free > 0 else []
+                for job in claimed:
+                    task = asyncio.create_task(self._process(job))
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+
+                if not claimed:
+                    try:
+                        await asyncio.wait_for(self._stopping.wait(), timeout=settings.JOB_POLL_INTERVAL)
+                    except asyncio.TimeoutError:
+                        pass
+                else:
+                    # Let in-flight jobs progress before claiming more
+                    await asyncio.sleep(0)
+                    if len(self._tasks) >= self.concurrency:
+                        await asyncio.wait(self._tasks, return_when=asyncio.FIRST_COMPLETED)
+
+            # Graceful shutdown: finish what we already claimed
+            if self._tasks:
+                await asyncio.wait(self._tasks)
+
+    def _claim(self, limit: int):
+        db = SessionLocal()
+        try:
+            jobs.requeue_stale(db)
+            return jobs.claim(db, self.name, limit)
+        finally:
+            db.close()
+
+    async def _process(self, job: Dict[str, Any]) -> None:
+        usage = TokenUsage()
+        tenant = ANONYMOUS.with_priority("bulk")
+        try:
+            tenant = await asyncio.to_thread(self._tenant, job.get("api_key_id"))
+            request = TextAnalysisRequest.model_validate(job["payload"])
+            # Queued jobs are bulk work in this process's fair-share scheduler
+            with tenant_scope(tenant, usage):
+                result = await run_with_deadline(
+                    text_analyzer_service.analyze_text(request), timeout=settings.REQUEST_TIMEOUT
+                )
+            payload = await asyncio.to_thread(self._store, job["id"], request.text, result, tenant, usage)
+        except Exception as e:
+            log_error(e, f"job_worker job={job['id']}")
+            final = await asyncio.to_thread(self._fail, job, str(e), tenant, usage)
+            payload = {"job_id": job["id"], "status": "failed", "error": str(e)} if final else None
+
+        if payload is not None and job.get("webhook_url"):
+            await self._notify(job["webhook_url"], payload)
+
+    def _tenant(self, api_key_id: Optional[int]) -> Tenant:
+        if api_key_id is None:
+            return ANONYMOUS.with_priority("bulk")
+        db = SessionLocal()
+        try:
+            tenant = api_keys.tenant_for_key_id(db, api_key_id)
+        finally:
+            db.close()
+        return (tenant or ANONYMOUS).with_priority("bulk")
+
+    def _store(self, job_id: int, text: str, result, tenant: Tenant, usage: TokenUsage) -> Dict[str, Any]:
+        db = SessionLocal()
+        try:
+            # Analysis row, key usage and job completion commit together
+            store_analysis(db, text, result)
+            api_keys.record_usage(db, tenant, usage)
+            data = result.model_dump()
+            jobs.complete(db, job_id, data)
+            db.commit()
+            return {"job_id": job_id, "status": "succeeded", "result": data}
+        finally:
+            db.close()
+
+    def _fail(self, job: Dict[str, Any], error: str, tenant: Tenant, usage: TokenUsage) -> bool:
+        db = SessionLocal()
+        try:
+            api_keys.record_usage(db, tenant, usage, failed=True)
+            return jobs.fail(db, job["id"], error, job["attempts"], job["max_attempts"])
+        finally:
+            db.close()
+
+    async def _notify(self, url: str, payload: Dict[str, Any]) -> None:
+        try:
+            await self._webhooks.post(url, json=payload)
+        except httpx.HTTPError as e:
+            log_error(e, f"job_webhook job={payload.get('job_id')}")
+
+
+def _run_process(concurrency: int) -> None:
+    worker = JobWorker(concurrency)
+
+    async def main() -> None:
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, worker.stop)
+        await worker.run()
+
+    asyncio.run(main())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--processes", type=int, default=settings.JOB_WORKER_PROCESSES)
+    parser.add_argument("--concurrency", type=int, default=settings.JOB_WORKER_CONCURRENCY)
+    args = parser.parse_args()
+
+    if args.processes <= 1:
+        _run_process(args.concurrency)
+        return
+
+    # spawn: each process builds its own DB engine and LLM clients
+    ctx = multiprocessing.get_context("spawn")
+    processes = [ctx.Process(target=_run_process, args=(args.concurrency,)) for _ in range(args.processes)]
+    for p in processes:
+        p.start()
+
+    def forward(signum, _frame):
+        for p in processes:
+            if p.is_alive():
+                os.kill(p.pid, signum)
+
+    signal.signal(signal.SIGTERM, forward)
+    signal.signal(signal.SIGINT, forward)
+    for p in processes:
+        p.join()
+
+
+if __name__ == "__main__":
+    main()
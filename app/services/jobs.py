@@ -0,0 +1,115 @@
+"""
+Durable analysis job queue on Postgres (SELECT ... FOR UPDATE SKIP LOCKED)
+"""
+
+from typing import Any, Dict, List, Optional
+
+import orjson
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.database.models import AnalysisJob
+from app.models.schemas import TextAnalysisRequest
+
+CLAIM_SQL = text(
+    """
+    UPDATE analysis_jobs
+    SET status = 'running', started_at = now(), attempts = attempts + 1, locked_by = :worker
+    WHERE id IN (
+        SELECT id FROM analysis_jobs
+        WHERE status = 'queued' AND run_after <= now()
+        ORDER BY run_after, id
+        FOR UPDATE SKIP LOCKED
+        LIMIT :limit
+    )
+    RETURNING id, payload, webhook_url, api_key_id, attempts, max_attempts
+    """
+)
+
+# Jobs whose worker died mid-flight go back to the queue
+REQUEUE_STALE_SQL = text(
+    """
+    UPDATE analysis_jobs
+    SET status = 'queued', locked_by = NULL
+    WHERE status = 'running' AND started_at < now() - make_interval(secs => :timeout)
+    """
+)
+
+
+def enqueue(
+    db: Session,
+    request: TextAnalysisRequest,
+    webhook_url: Optional[str] = None,
+    api_key_id: Optional[int] = None,
+) -> AnalysisJob:
+    """Insert a queued job and commit"""
+    job = AnalysisJob(
+        status="queued",
+        payload=request.model_dump(),
+        webhook_url=webhook_url,
+        api_key_id=api_key_id,
+        max_attempts=settings.JOB_MAX_ATTEMPTS,
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def claim(db: Session, worker: str, limit: int) -> List[Dict[str, Any]]:
+    """Atomically mark up to `limit` queued jobs as running for this worker"""
+    rows = db.execute(CLAIM_SQL, {"worker": worker, "limit": limit}).mappings().all()
+    db.commit()
+    return [dict(r) for r in rows]
+
+
+def complete(db: Session, job_id: int, result: Dict[str, Any]) -> None:
+    db.execute(
+        text(
+            "UPDATE analysis_jobs SET status = 'succeeded', result = CAST(:result AS json), "
+            "error = NULL, finished_at = now() WHERE id = :id"
+        ),
+        {"id": job_id, "result": orjson.dumps(result).decode("utf-8")},
+    )
+
+
+def fail(db: Session, job_id: int, error: str, attempts: int, max_attempts: int) -> bool:
+    """Requeue with backoff, or mark failed once attempts are exhausted. Returns True if final."""
+    final = attempts >= max_attempts
+    if final:
+        db.execute(
+            text("UPDATE analysis_jobs SET status = 'failed', error = :error, finished_at = now() WHERE id = :id"),
+            {"id": job_id, "error": error},
+        )
+    else:
+        db.execute(
+            text(
+                "UPDATE analysis_jobs SET status = 'queued', error = :error, locked_by = NULL, "
+                "run_after = now() + make_interval(secs => :delay) WHERE id = :id"
+            ),
+            {"id": job_id, "error": error, "delay": settings.JOB_RETRY_BACKOFF * attempts},
+        )
+    db.commit()
+    return final
+
+
+def requeue_stale(db: Session) -> int:
+    result = db.execute(REQUEUE_STALE_SQL, {"timeout": settings.JOB_VISIBILITY_TIMEOUT})
+    db.commit()
+    return result.rowcount
+
+
+def job_status(job: AnalysisJob) -> Dict[str, Any]:
+    """Public view of a job for polling and webhooks"""
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "attempts": job.attempts,
+        "result": job.result,
+        "error": job.error,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+
@@ -0,0 +1,36 @@
+"""
+Persistence of analysis results (shared by the API and queue workers)
+"""
+
+from sqlalchemy.orm import Session
+
+from app.database.models import TextAnalysis
+from app.models.schemas import TextAnalysisResponse
+from app.services import analytics
+from app.services.documents import document_store
+
+
+def store_analysis(db: Session, text: str, result: TextAnalysisResponse) -> TextAnalysis:
+    """
+    Add an analysis row (plus its document and rollup updates) to the
+    session. The caller commits.
+    """
+    db_analysis = TextAnalysis(
+        document_hash=document_store.get_or_create(db, text),
+        summary=result.summary,
+        title=result.metadata.title,
+        topics=result.metadata.topics,
+        sentiment=result.metadata.sentiment,
+        keywords=result.metadata.keywords,
+        processing_time=result.processing_time,
+        confidence_score=result.confidence_score,
+    )
+    db.add(db_analysis)
+    # Rollups are updated in the same transaction so they never drift
+    analytics.record_analysis(
+        db,
+        sentiment=result.metadata.sentiment,
+        topics=result.metadata.topics,
+        keywords=result.metadata.keywords,
+    )
+    return db_analysis
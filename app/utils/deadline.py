@@ -0,0 +1,72 @@
+"""
+Request deadlines and client-disconnect cancellation
+"""
+
+import asyncio
+from contextlib import suppress
+from typing import Any, Awaitable, Optional
+
+from fastapi import Request
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when work does not finish before the request deadline"""
+
+
+class ClientDisconnected(Exception):
+    """Raised when the HTTP client goes away before work finishes"""
+
+
+async def run_with_deadline(
+    awaitable: Awaitable[Any],
+    timeout: Optional[float] = None,
+    request: Optional[Request] = None,
+    poll_interval: float = 0.25,
+) -> Any:
+    """
+    Await `awaitable` under an optional deadline, cancelling it if the
+    deadline passes or the client disconnects.
+
+    Args:
+        awaitable: Coroutine or future to run
+        timeout: Seconds until the deadline (None or <= 0 disables it)
+        request: Incoming request polled for disconnects
+        poll_interval: Seconds between disconnect checks
+
+    Returns:
+        The awaitable's result
+    """
+    task = asyncio.ensure_future(awaitable)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout if timeout and timeout > 0 else None
+
+    try:
+        while True:
+            wait = poll_interval if request is not None else None
+            if deadline is not None:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    raise DeadlineExceeded(f"Deadline of {timeout:.2f}s exceeded")
+                wait = remaining if wait is None else min(wait, remaining)
+
+            done, _ = await asyncio.wait({task}, timeout=wait)
+            if done:
+                return task.result()
+
+            if request is not None and await request.is_disconnected():
+                raise ClientDisconnected("Client disconnected before completion")
+    finally:
+        # Cancel abandoned work so the upstream call stops consuming quota
+        if not task.done():
+            task.cancel()
+            with suppress(asyncio.CancelledError, Exception):
+                await task
+
+
+def resolve_timeout(header_value: Optional[float], default: float, maximum: float) -> float:
+    """Pick the effective request timeout from a header, clamped to the configured max"""
+    if header_value is None or header_value <= 0:
+        return default
+    if maximum > 0:
+        return min(header_value, maximum)
+    return header_value
@@ -0,0 +1,91 @@
+"""
+Per-item overhead of confidence scoring and response assembly
+
+Compares the per-item path used by analyze_text (TextMetadata/TextAnalysisResponse
+validation + _compute_confidence) with assemble_batch (NumPy confidence
+scoring + model_construct) on pre-validated LLM results.
+
+Usage:
+    python -m benchmarks.batch [--items 10000,50000] [--repeat 3] [--output out.json]
+"""
+
+import argparse
+import json
+import random
+import time
+from typing import Any, Dict, List
+
+from benchmarks.common import save_results
+from benchmarks.micro import make_text
+
+from app.models.schemas import LLMAnalysisResponse, TextAnalysisRequest, TextAnalysisResponse, TextMetadata
+from app.services.text_analyzer import text_analyzer_service
+
+
+def make_batch(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    texts = [make_text(rng.choice([120, 800, 2500]), seed=i) for i in range(min(n, 500))]
+    requests = [TextAnalysisRequest.model_construct(text=texts[i % len(texts)], include_keywords=True, include_sentiment=True) for i in range(n)]
+    analyses = [
+        LLMAnalysisResponse(
+            summary="A short summary.",
+            title=f"Doc {i}",
+            topics=["alpha", "beta", "gamma" if i % 4 else ""],
+            sentiment=rng.choice(["positive", "neutral", "negative"]),
+        )
+        for i in range(n)
+    ]
+    keywords = [["market", "data", "team"][: rng.randint(0, 3)] for _ in range(n)]
+    times = [rng.random() for _ in range(n)]
+    return requests, analyses, keywords, times
+
+
+def per_item(requests, analyses, keywords, times) -> List[TextAnalysisResponse]:
+    out = []
+    for r, a, kw, t in zip(requests, analyses, keywords, times):
+        metadata = TextMetadata(title=a.title, topics=a.topics, sentiment=a.sentiment, keywords=kw)
+        confidence = text_analyzer_service._compute_confidence(r.text, a.summary, metadata)
+        out.append(TextAnalysisResponse(summary=a.summary, metadata=metadata, processing_time=t, confidence_score=confidence))
+    return out
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(sizes: List[int], repeat: int) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    for n in sizes:
+        batch = make_batch(n)
+        slow = best_of(lambda: per_item(*batch), repeat)
+        fast = best_of(lambda: text_analyzer_service.assemble_batch(*batch), repeat)
+        results[str(n)] = {
+            "per_item_us": round(slow / n * 1e6, 3),
+            "batch_us": round(fast / n * 1e6, 3),
+            "per_item_total_ms": round(slow * 1000, 3),
+            "batch_total_ms": round(fast * 1000, 3),
+            "speedup": round(slow / fast, 2),
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", default="10000,50000")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    results = run([int(s) for s in args.items.split(",")], args.repeat)
+    print(json.dumps(results, indent=2))
+    path = save_results("batch", results, args.output)
+    print(f"Saved results to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Shared helpers for benchmark result reporting
+"""
+
+import json
+import os
+import platform
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Ensure project root on path when run as a script
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+RESULTS_DIR = ROOT / "benchmarks" / "results"
+
+
+def percentile(samples: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile (pct in 0..100)"""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    k = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[k]
+
+
+def summarize(samples: List[float]) -> Dict[str, Optional[float]]:
+    """Latency summary in milliseconds"""
+    def ms(v: Optional[float]) -> Optional[float]:
+        return round(v * 1000, 3) if v is not None else None
+
+    return {
+        "count": len(samples),
+        "mean_ms": ms(sum(samples) / len(samples)) if samples else None,
+        "p50_ms": ms(percentile(samples, 50)),
+        "p95_ms": ms(percentile(samples, 95)),
+        "p99_ms": ms(percentile(samples, 99)),
+        "max_ms": ms(max(samples)) if samples else None,
+    }
+
+
+def process_cpu_seconds(pid: int) -> Optional[float]:
+    """User+system CPU seconds for a process (Linux /proc only)"""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        ticks = os.sysconf("SC_CLK_TCK")
+        # utime and stime are fields 14 and 15 (1-based) of the full line
+        return (int(fields[11]) + int(fields[12])) / ticks
+    except Exception:
+        return None
+
+
+def save_results(name: str, results: Dict[str, Any], output: Optional[str] = None) -> Path:
+    """Write results with run metadata to JSON and return the path"""
+    path = Path(output) if output else RESULTS_DIR / f"{name}-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "benchmark": name,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "results": results,
+    }
+    path.write_text(json.dumps(payload, indent=2))
+    return path
+
+
+def compare_results(baseline_path: str, current: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Compare latency metrics against a saved baseline. Returns a list of
+    regressions where a *_ms metric grew by more than `threshold` (fraction).
+    """
+    baseline = json.loads(Path(baseline_path).read_text())["results"]
+    regressions: List[str] = []
+
+    def walk(base: Any, cur: Any, prefix: str) -> None:
+        if isinstance(base, dict) and isinstance(cur, dict):
+            for key, value in base.items():
+                if key in cur:
+                    walk(value, cur[key], f"{prefix}.{key}" if prefix else key)
+        elif prefix.endswith("_ms") and isinstance(base, (int, float)) and isinstance(cur, (int, float)):
+            if base > 0 and (cur - base) / base > threshold:
+                regressions.append(f"{prefix}: {base:.3f} -> {cur:.3f} ms (+{(cur - base) / base:.0%})")
+
+    walk(baseline, current, "")
+    return regressions
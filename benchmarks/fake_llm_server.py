@@ -0,0 +1,105 @@
+"""
+Fake OpenAI-compatible chat completions server for load testing
+
+Usage:
+    python -m benchmarks.fake_llm_server --port 9000 --latency-ms 800 --jitter 0.4 --error-rate 0.02
+
+Point the app at it with OPENAI_BASE_URL=http://127.0.0.1:9000/v1 and any
+non-empty OPENAI_API_KEY.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+
+def create_app(latency_ms: float, jitter: float, error_rate: float, seed: int = None) -> FastAPI:
+    """
+    Build the fake server.
+
+    Args:
+        latency_ms: Median response latency in milliseconds
+        jitter: Sigma of the lognormal latency distribution (0 = constant)
+        error_rate: Fraction of requests answered with a 500 error
+        seed: RNG seed for reproducible runs
+    """
+    rng = random.Random(seed)
+    app = FastAPI(title="Fake LLM")
+    app.state.requests = 0
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        app.state.requests += 1
+
+        delay = latency_ms / 1000.0
+        if jitter > 0:
+            delay *= rng.lognormvariate(0, jitter)
+        await asyncio.sleep(delay)
+
+        if rng.random() < error_rate:
+            return JSONResponse(
+                status_code=500,
+                content={"error": {"message": "injected failure", "type": "server_error"}},
+            )
+
+        prompt = " ".join(str(m.get("content", "")) for m in body.get("messages", []))
+        content = json.dumps(
+            {
+                "title": "Benchmark Document",
+                "summary": "A synthetic summary produced by the fake LLM server.",
+                "sentiment": rng.choice(["positive", "neutral", "negative"]),
+                "topics": ["benchmark", "latency", "throughput"],
+            }
+        )
+        prompt_tokens = max(1, len(prompt) // 4)
+        completion_tokens = max(1, len(content) // 4)
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake-model"),
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    @app.get("/stats")
+    async def stats():
+        return {"requests": app.state.requests}
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency-ms", type=float, default=800.0)
+    parser.add_argument("--jitter", type=float, default=0.3)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    app = create_app(args.latency_ms, args.jitter, args.error_rate, args.seed)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+End-to-end load generator for /api/analyze and /api/history
+
+Start the fake LLM server and the app first, e.g.:
+    python -m benchmarks.fake_llm_server --port 9000 &
+    OPENAI_API_KEY=fake OPENAI_BASE_URL=http://127.0.0.1:9000/v1 DEBUG=False \\
+        uvicorn main:app --port 8000 &
+
+Then run:
+    python -m benchmarks.load --url http://127.0.0.1:8000 --concurrency 32 \\
+        --duration 30 --analyze-ratio 0.3 --server-pid <uvicorn pid>
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from benchmarks.common import compare_results, process_cpu_seconds, save_results, summarize
+from benchmarks.micro import make_text
+
+HISTORY_QUERIES = [
+    {},
+    {"sentiment": "positive"},
+    {"sentiment": "negative", "limit": 50},
+    {"keyword": "data"},
+    {"search": "market"},
+    {"skip": 20, "limit": 20},
+]
+
+
+class EndpointStats:
+    def __init__(self) -> None:
+        self.latencies: List[float] = []
+        self.status_counts: Dict[str, int] = {}
+        self.errors = 0
+
+    def record(self, latency: float, status: Optional[int]) -> None:
+        key = str(status) if status is not None else "error"
+        self.status_counts[key] = self.status_counts.get(key, 0) + 1
+        if status is not None and status < 400:
+            self.latencies.append(latency)
+        else:
+            self.errors += 1
+
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        total = sum(self.status_counts.values())
+        return {
+            "requests": total,
+            "rps": round(total / elapsed, 2) if elapsed else None,
+            "errors": self.errors,
+            "status_counts": self.status_counts,
+            "latency": summarize(self.latencies),
+        }
+
+
+async def worker(
+    client: httpx.AsyncClient,
+    deadline: float,
+    analyze_ratio: float,
+    rng: random.Random,
+    stats: Dict[str, EndpointStats],
+) -> None:
+    while time.perf_counter() < deadline:
+        if rng.random() < analyze_ratio:
+            name = "analyze"
+            text = make_text(rng.choice([200, 1000, 4000]), seed=rng.randint(0, 1_000_000))
+            send = client.post("/api/analyze", json={"text": text})
+        else:
+            name = "history"
+            send = client.get("/api/history", params=rng.choice(HISTORY_QUERIES))
+
+        start = time.perf_counter()
+        try:
+            resp = await send
+            status: Optional[int] = resp.status_code
+        except httpx.HTTPError:
+            status = None
+        stats[name].record(time.perf_counter() - start, status)
+
+
+async def run(url: str, concurrency: int, duration: float, analyze_ratio: float, seed: int, server_pid: Optional[int]) -> Dict[str, Any]:
+    stats = {"analyze": EndpointStats(), "history": EndpointStats()}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    cpu_before = process_cpu_seconds(server_pid) if server_pid else None
+    start = time.perf_counter()
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=120) as client:
+        deadline = start + duration
+        await asyncio.gather(
+            *[worker(client, deadline, analyze_ratio, random.Random(seed + i), stats) for i in range(concurrency)]
+        )
+    elapsed = time.perf_counter() - start
+    cpu_after = process_cpu_seconds(server_pid) if server_pid else None
+
+    total = sum(sum(s.status_counts.values()) for s in stats.values())
+    results: Dict[str, Any] = {
+        "config": {
+            "url": url,
+            "concurrency": concurrency,
+            "duration_s": duration,
+            "analyze_ratio": analyze_ratio,
+            "seed": seed,
+        },
+        "elapsed_s": round(elapsed, 3),
+        "total_requests": total,
+        "rps": round(total / elapsed, 2) if elapsed else None,
+        "endpoints": {name: s.report(elapsed) for name, s in stats.items()},
+    }
+    if cpu_before is not None and cpu_after is not None and total:
+        cpu = cpu_after - cpu_before
+        results["server_cpu_s"] = round(cpu, 3)
+        results["cpu_per_request_ms"] = round(cpu / total * 1000, 3)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--analyze-ratio", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--server-pid", type=int, default=None, help="Server PID for CPU accounting")
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--compare", default=None, help="Baseline JSON to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown fraction")
+    args = parser.parse_args()
+
+    results = asyncio.run(
+        run(args.url, args.concurrency, args.duration, args.analyze_ratio, args.seed, args.server_pid)
+    )
+    print(json.dumps(results, indent=2))
+    path = save_results("load", results, args.output)
+    print(f"Saved results to {path}")
+
+    if args.compare:
+        regressions = compare_results(args.compare, results, args.threshold)
+        for r in regressions:
+            print(f"REGRESSION {r}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
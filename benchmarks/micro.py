@@ -0,0 +1,111 @@
+"""
+Microbenchmarks for the CPU-bound parts of the analysis path
+
+Usage:
+    python -m benchmarks.micro [--sizes 100,1000,10000] [--repeat 5] [--output out.json] [--compare baseline.json]
+"""
+
+import argparse
+import json
+import random
+import sys
+import timeit
+from typing import Any, Callable, Dict, List
+
+from benchmarks.common import compare_results, save_results
+
+from app.lib.keyword_extractor import keyword_extractor
+from app.lib.llm_client import llm_client
+from app.models.schemas import TextMetadata
+from app.services.text_analyzer import text_analyzer_service
+
+WORDS = (
+    "market growth revenue customer product team launch privacy model data "
+    "cloud security report quarter strategy design research policy network user"
+).split()
+
+
+def make_text(n_chars: int, seed: int = 0) -> str:
+    """Deterministic pseudo-English text of roughly n_chars characters"""
+    rng = random.Random(seed)
+    parts: List[str] = []
+    size = 0
+    while size < n_chars:
+        sentence = " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 14))).capitalize() + "."
+        parts.append(sentence)
+        size += len(sentence) + 1
+    return " ".join(parts)[:n_chars]
+
+
+def time_call(fn: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Best and median per-call time in microseconds"""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    runs = sorted(t / number for t in timer.repeat(repeat=repeat, number=number))
+    return {
+        "calls_per_run": number,
+        "best_us": round(runs[0] * 1e6, 3),
+        "median_us": round(runs[len(runs) // 2] * 1e6, 3),
+    }
+
+
+def run(sizes: List[int], repeat: int) -> Dict[str, Any]:
+    results: Dict[str, Any] = {"extract_keywords": {}, "parse_json": {}, "compute_confidence": {}}
+    metadata = TextMetadata(
+        title="Benchmark", topics=["a", "b", "c"], sentiment="neutral", keywords=["x", "y", "z"]
+    )
+    payload = {
+        "title": "Benchmark Document",
+        "summary": "A synthetic summary.",
+        "sentiment": "neutral",
+        "topics": ["benchmark", "latency", "throughput"],
+    }
+    raw = json.dumps(payload)
+    variants = {
+        "plain": raw,
+        "fenced": f"```json\n{raw}\n```",
+        "prose": f"Here is the analysis you asked for: {raw} Let me know if you need more.",
+    }
+
+    for size in sizes:
+        text = make_text(size)
+        results["extract_keywords"][str(size)] = time_call(lambda: keyword_extractor.extract_keywords(text), repeat)
+        results["compute_confidence"][str(size)] = time_call(
+            lambda: text_analyzer_service._compute_confidence(text, "summary", metadata), repeat
+        )
+
+    for name, content in variants.items():
+        results["parse_json"][name] = time_call(lambda: llm_client._parse_json(content), repeat)
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="100,1000,10000")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--compare", default=None, help="Baseline JSON to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown fraction")
+    args = parser.parse_args()
+
+    results = run([int(s) for s in args.sizes.split(",")], args.repeat)
+    # Express timings as *_ms too so the generic comparer picks them up
+    for group in results.values():
+        for entry in group.values():
+            entry["median_ms"] = entry["median_us"] / 1000.0
+
+    print(json.dumps(results, indent=2))
+    path = save_results("micro", results, args.output)
+    print(f"Saved results to {path}")
+
+    if args.compare:
+        regressions = compare_results(args.compare, results, args.threshold)
+        for r in regressions:
+            print(f"REGRESSION {r}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
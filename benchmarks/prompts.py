@@ -0,0 +1,82 @@
+"""
+Input tokens per call: legacy prompt layout vs the selected v2 template
+
+Counts tokens with tiktoken when installed (o200k_base), otherwise
+estimates chars / 4. Also reports how many leading tokens are identical
+across different inputs, i.e. what a provider prefix cache can reuse.
+
+Usage:
+    python -m benchmarks.prompts [--sizes 200,1000,5000] [--output out.json]
+"""
+
+import argparse
+import json
+from typing import Any, Callable, Dict, List
+
+from benchmarks.common import save_results
+from benchmarks.micro import make_text
+
+from app.prompts.registry import OUTPUT_MODES, prompt_registry
+
+
+def token_counter() -> Callable[[str], List[Any]]:
+    try:
+        import tiktoken
+
+        encoding = tiktoken.get_encoding("o200k_base")
+        return encoding.encode
+    except Exception:
+        # ~4 characters per token; tokens as 4-char chunks keep prefix comparison meaningful
+        return lambda s: [s[i:i + 4] for i in range(0, len(s), 4)]
+
+
+def message_tokens(encode, messages) -> List[Any]:
+    return [t for m in messages for t in encode(m["content"])]
+
+
+def shared_prefix(a: List[Any], b: List[Any]) -> int:
+    n = 0
+    for x, y in zip(a, b):
+        if x != y:
+            break
+        n += 1
+    return n
+
+
+def run(sizes: List[int]) -> Dict[str, Any]:
+    encode = token_counter()
+    legacy = prompt_registry.get("comprehensive", "full", version=1)
+    results: Dict[str, Any] = {}
+    for n in sizes:
+        texts = [make_text(n, seed=1), make_text(n, seed=2)]
+        entry: Dict[str, Any] = {}
+        for label, pick in [("v1_legacy", lambda mode: legacy)] + [
+            (mode, lambda mode: prompt_registry.select("comprehensive", n, mode)) for mode in OUTPUT_MODES
+        ]:
+            template = pick(label)
+            first, second = (message_tokens(encode, template.render(t)) for t in texts)
+            text_tokens = len(encode(texts[0]))
+            entry[label] = {
+                "template": template.id,
+                "input_tokens": len(first),
+                "overhead_tokens": len(first) - text_tokens,
+                "shared_prefix_tokens": shared_prefix(first, second),
+            }
+        results[str(n)] = entry
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="200,1000,5000")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    results = run([int(s) for s in args.sizes.split(",")])
+    print(json.dumps(results, indent=2))
+    path = save_results("prompts", results, args.output)
+    print(f"Saved results to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Serialization benchmark for a /api/history page
+
+Compares the old path (ORM-style objects -> dicts with isoformat ->
+jsonable_encoder -> json.dumps) against the current one (row tuples ->
+dicts -> orjson) for one page of history rows.
+
+Usage:
+    python -m benchmarks.serialization [--rows 100] [--repeat 5] [--output out.json]
+"""
+
+import argparse
+import json
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+
+from benchmarks.common import save_results
+from benchmarks.micro import make_text, time_call
+
+from app.routers.api import HISTORY_FIELDS, serialize_history_rows
+
+
+def make_rows(n: int) -> List[tuple]:
+    now = datetime.now(timezone.utc)
+    return [
+        (
+            i,
+            f"Document {i}",
+            make_text(240, seed=i),
+            ["benchmark", "latency", "throughput"],
+            "neutral",
+            ["market", "data", "team"],
+            0.8123,
+            now - timedelta(minutes=i),
+        )
+        for i in range(n)
+    ]
+
+
+def legacy_page(objects: List[SimpleNamespace]) -> bytes:
+    content = {
+        "analyses": [
+            {
+                "id": a.id,
+                "title": a.title,
+                "summary": a.summary,
+                "topics": a.topics,
+                "sentiment": a.sentiment,
+                "keywords": a.keywords,
+                "processing_time": a.processing_time,
+                "created_at": a.created_at.isoformat() if a.created_at else None,
+            }
+            for a in objects
+        ],
+        "total": len(objects),
+        "skip": 0,
+        "limit": len(objects),
+        "filters": {"sentiment": None, "keyword": None, "search": None},
+    }
+    return json.dumps(jsonable_encoder(content), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def orjson_page(rows: List[tuple]) -> bytes:
+    return orjson.dumps(
+        {
+            "analyses": serialize_history_rows(rows),
+            "total": len(rows),
+            "skip": 0,
+            "limit": len(rows),
+            "filters": {"sentiment": None, "keyword": None, "search": None},
+        }
+    )
+
+
+def run(n_rows: int, repeat: int) -> Dict[str, Any]:
+    rows = make_rows(n_rows)
+    objects = [SimpleNamespace(**dict(zip(HISTORY_FIELDS, r))) for r in rows]
+
+    legacy = time_call(lambda: legacy_page(objects), repeat)
+    fast = time_call(lambda: orjson_page(rows), repeat)
+    return {
+        "rows": n_rows,
+        "legacy_jsonable_encoder": {**legacy, "median_ms": legacy["median_us"] / 1000.0},
+        "orjson_tuples": {**fast, "median_ms": fast["median_us"] / 1000.0},
+        "speedup": round(legacy["median_us"] / fast["median_us"], 2),
+        "bytes_legacy": len(legacy_page(objects)),
+        "bytes_orjson": len(orjson_page(rows)),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    results = run(args.rows, args.repeat)
+    print(json.dumps(results, indent=2))
+    path = save_results("serialization", results, args.output)
+    print(f"Saved results to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Per-worker memory of the NLP models under each NLP_SHARED_MODE
+
+For every mode a fresh "master" process imports the keyword extractor,
+preloads it unless mode=worker, then forks N workers the way gunicorn does
+with preload_app. Each worker warms up and extracts keywords from sample
+texts; once all are ready the master reads RSS, PSS (RSS with shared pages
+divided among the processes sharing them) and USS (private pages) from
+/proc/<pid>/smaps_rollup. PSS/USS are what grow with worker count.
+
+Linux only. Needs the NLTK data (punkt, tagger, stopwords) installed;
+without it the extractor runs in regex fallback mode and the modes match.
+
+Usage:
+    python -m benchmarks.worker_memory [--workers 4] [--modes worker,preload,mmap] [--output out.json]
+"""
+
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Any, Dict, List
+
+from benchmarks.common import ROOT, save_results
+
+
+def memory_kb(pid: int) -> Dict[str, int]:
+    """rss/pss/uss in kB from /proc/<pid>/smaps_rollup"""
+    fields: Dict[str, int] = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1])
+    return {
+        "rss_kb": fields.get("Rss", 0),
+        "pss_kb": fields.get("Pss", 0),
+        "uss_kb": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+    }
+
+
+def run_master(mode: str, workers: int, texts: int) -> Dict[str, Any]:
+    """Body of the per-mode master process (NLP_SHARED_MODE is already in the env)"""
+    from benchmarks.micro import make_text
+    from app.lib.keyword_extractor import keyword_extractor
+
+    if mode != "worker":
+        keyword_extractor.warm_up()
+        gc.collect()
+        gc.freeze()
+    samples = [make_text(2000, seed=i) for i in range(texts)]
+
+    ready_r, ready_w = os.pipe()
+    release_r, release_w = os.pipe()
+    pids: List[int] = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            os.close(ready_r)
+            os.close(release_w)
+            keyword_extractor.warm_up()
+            for sample in samples:
+                keyword_extractor.extract_keywords(sample)
+            gc.collect()
+            os.write(ready_w, b"x")
+            os.read(release_r, 1)  # stay alive until the master has measured
+            os._exit(0)
+        pids.append(pid)
+
+    os.close(ready_w)
+    for _ in range(workers):
+        os.read(ready_r, 1)
+    per_worker = [memory_kb(pid) for pid in pids]
+    master = memory_kb(os.getpid())
+    os.close(release_w)
+    for pid in pids:
+        os.waitpid(pid, 0)
+
+    def mean(key: str) -> int:
+        return round(sum(w[key] for w in per_worker) / len(per_worker))
+
+    return {
+        "nltk_ready": keyword_extractor._nltk_ready,
+        "tagger": type(keyword_extractor._tagger).__name__ if keyword_extractor._tagger is not None else None,
+        "master": master,
+        "worker_mean": {k: mean(k) for k in ("rss_kb", "pss_kb", "uss_kb")},
+        "total_pss_kb": master["pss_kb"] + sum(w["pss_kb"] for w in per_worker),
+    }
+
+
+def run(modes: List[str], workers: int, texts: int, mmap_dir: str) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    for mode in modes:
+        env = dict(os.environ, NLP_SHARED_MODE=mode, NLP_MMAP_DIR=mmap_dir)
+        out = subprocess.run(
+            [sys.executable, "-m", "benchmarks.worker_memory", "--master", mode,
+             "--workers", str(workers), "--texts", str(texts)],
+            cwd=ROOT, env=env, check=True, capture_output=True, text=True,
+        )
+        results[mode] = json.loads(out.stdout.strip().splitlines()[-1])
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--modes", default="worker,preload,mmap")
+    parser.add_argument("--texts", type=int, default=20)
+    parser.add_argument("--mmap-dir", default=None, help="tagger export dir (default: a temp dir)")
+    parser.add_argument("--master", default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    if args.master:
+        print(json.dumps(run_master(args.master, args.workers, args.texts)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = run(args.modes.split(","), args.workers, args.texts, args.mmap_dir or tmp)
+    print(json.dumps(results, indent=2))
+    path = save_results("worker_memory", results, args.output)
+    print(f"Saved results to {path}")
+
+
+if __name__ == "__main__":
+    main()
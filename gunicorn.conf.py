@@ -0,0 +1,64 @@
+"""
+Gunicorn configuration for production
+
+Usage:
+    gunicorn -c gunicorn.conf.py main:app
+
+The app is preloaded in the master so code and read-only data are shared
+copy-on-write; connection pools (SQLAlchemy engine, AsyncOpenAI clients)
+are re-created in each worker after fork so no sockets are shared.
+NLP models are loaded in the master before the first fork (NLP_SHARED_MODE).
+"""
+
+import gc
+import multiprocessing
+
+from app.core.config import settings
+
+# Binding
+bind = f"{settings.HOST}:{settings.PORT}"
+
+# Workers: uvicorn workers, one async loop per process, 2 * cores + 1 unless set
+worker_class = "app.core.workers.TunedUvicornWorker"
+workers = settings.WORKERS or (multiprocessing.cpu_count() * 2 + 1)
+preload_app = settings.PRELOAD_APP
+
+# Timeouts
+timeout = settings.WORKER_TIMEOUT
+graceful_timeout = settings.GRACEFUL_TIMEOUT
+keepalive = settings.KEEPALIVE
+
+# Recycle workers periodically to bound memory growth
+max_requests = settings.MAX_REQUESTS
+max_requests_jitter = settings.MAX_REQUESTS_JITTER
+
+# Logging
+accesslog = "-" if settings.DEBUG else None
+errorlog = "-"
+loglevel = "info" if settings.DEBUG else "warning"
+
+
+def when_ready(server):
+    """Load NLP models once in the master so every worker shares the pages"""
+    if settings.NLP_SHARED_MODE == "worker" or not preload_app:
+        return
+    from app.lib.keyword_extractor import keyword_extractor
+
+    keyword_extractor.warm_up()
+    # Move everything allocated so far out of the collector's generations:
+    # GC passes in the workers would otherwise write to these objects' headers
+    # and un-share their copy-on-write pages
+    gc.collect()
+    gc.freeze()
+    server.log.info("Preloaded NLP models in master (mode=%s)", settings.NLP_SHARED_MODE)
+
+
+def post_fork(server, worker):
+    """Drop pooled connections inherited from the master"""
+    from app.database.database import engine
+    from app.lib.llm_client import llm_client
+
+    # close=False: leave the parent's sockets alone, just forget them here
+    engine.dispose(close=False)
+    llm_client.pool.reset_clients()
+    server.log.info("Worker %s: re-initialized DB engine and LLM clients", worker.pid)
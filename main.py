@@ -3,17 +3,34 @@ FastAPI Text Analysis Application
 Main entry point for the application
 """
 
-from fastapi import FastAPI, Request
+from contextlib import asynccontextmanager
+
+from fastapi import Depends, FastAPI, Request
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 import uvicorn
 
-from app.routers import api, web
+from app.routers import api, debug, stats, web
+from app.core.auth import get_tenant, require_admin
 from app.core.config import settings
 from app.database.database import engine
 from app.database.models import Base
+from app.database.partitions import ensure_partitions
 from app.middleware.logging import LoggingMiddleware
+from app.core.warmup import warmup_manager
+from app.lib.profiling import loop_monitor
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up models and connection pools before serving, keep them alive after"""
+    await warmup_manager.start()
+    loop_monitor.start(settings.LOOP_BLOCK_MS)
+    yield
+    loop_monitor.stop()
+    await warmup_manager.stop()
+
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -21,11 +38,14 @@ app = FastAPI(
     description="Analyze unstructured text to extract summaries, metadata, and sentiment",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
-# Create database tables
+# Create database tables and the current/upcoming monthly partitions
 Base.metadata.create_all(bind=engine)
+ensure_partitions(engine)
 
 # Add middleware
 if settings.DEBUG:
@@ -36,6 +56,8 @@ app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
 # Include routers
 app.include_router(api.router, prefix="/api", tags=["API"])
+app.include_router(stats.router, prefix="/api/stats", tags=["Stats"], dependencies=[Depends(get_tenant)])
+app.include_router(debug.router, prefix="/api/debug", tags=["Debug"], dependencies=[Depends(require_admin)])
 app.include_router(web.router, tags=["Web"])
 
 # Templates
@@ -51,5 +73,5 @@ if __name__ == "__main__":
         "main:app",
         host=settings.HOST,
         port=settings.PORT,
-        reload=settings.DEBUG
+        reload=settings.RELOAD
     )
@@ -0,0 +1,65 @@
+import os
+import sys
+import uuid
+from pathlib import Path
+
+# Ensure project root on path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import sessionmaker
+
+
+@pytest.fixture(scope="session")
+def pg_engine():
+    """
+    Engine on a throwaway database created next to TEST_DATABASE_URL
+    (a Postgres server the tests may create databases on). Tests using
+    it are skipped when the variable is unset or the server is down.
+    """
+    url = os.environ.get("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL is not set")
+
+    from app.database.models import Base
+    from app.database.partitions import ensure_partitions
+
+    admin = create_engine(url, isolation_level="AUTOCOMMIT")
+    name = f"jouster_test_{uuid.uuid4().hex[:8]}"
+    try:
+        with admin.connect() as conn:
+            conn.execute(text(f'CREATE DATABASE "{name}"'))
+    except Exception as e:
+        admin.dispose()
+        pytest.skip(f"Postgres at TEST_DATABASE_URL unavailable: {e}")
+
+    engine = create_engine(make_url(url).set(database=name))
+    try:
+        Base.metadata.create_all(bind=engine)
+        ensure_partitions(engine)
+        yield engine
+    finally:
+        engine.dispose()
+        with admin.connect() as conn:
+            conn.execute(text(f'DROP DATABASE IF EXISTS "{name}"'))
+        admin.dispose()
+
+
+@pytest.fixture
+def pg_session(pg_engine):
+    """Session on the test database; every table is emptied afterwards"""
+    from app.database.models import Base
+
+    session = sessionmaker(bind=pg_engine)()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.close()
+        tables = ", ".join(f'"{t.name}"' for t in Base.metadata.sorted_tables)
+        with pg_engine.begin() as conn:
+            conn.execute(text(f"TRUNCATE {tables} RESTART IDENTITY CASCADE"))
@@ -0,0 +1,56 @@
+import sys
+from pathlib import Path
+
+# Ensure project root on path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.database.models import SentimentRollup, TermRollup
+from app.models.schemas import TextAnalysisResponse, TextMetadata
+from app.services import analytics
+from app.services.storage import store_analysis
+
+
+def make_result(sentiment, topics, keywords):
+    return TextAnalysisResponse(
+        summary="Summary.",
+        metadata=TextMetadata(title="T", topics=topics, sentiment=sentiment, keywords=keywords),
+        processing_time=0.1,
+        confidence_score=0.5,
+    )
+
+
+def snapshot(db):
+    sentiments = {
+        (r.granularity, r.bucket_start, r.sentiment): r.count for r in db.query(SentimentRollup).all()
+    }
+    terms = {(r.kind, r.day, r.term): r.count for r in db.query(TermRollup).all()}
+    return sentiments, terms
+
+
+def test_incremental_rollups_match_rebuild(pg_session):
+    results = [
+        make_result("positive", ["AI", "Work", ""], ["ai", "team", "ai"]),
+        make_result("positive", ["AI", " Privacy ", ""], ["privacy"]),
+        make_result("negative", ["Work", "", ""], []),
+    ]
+    for i, result in enumerate(results):
+        store_analysis(pg_session, f"text number {i}", result)
+        pg_session.commit()
+
+    incremental = snapshot(pg_session)
+    analytics.rebuild_rollups(pg_session)
+    rebuilt = snapshot(pg_session)
+
+    assert incremental == rebuilt
+    sentiments, terms = rebuilt
+    assert sum(c for (g, _, s), c in sentiments.items() if g == "day" and s == "positive") == 2
+    assert {(k, t): c for (k, _, t), c in terms.items()} == {
+        ("topic", "AI"): 2,
+        ("topic", "Work"): 2,
+        ("topic", "Privacy"): 1,
+        ("keyword", "ai"): 1,
+        ("keyword", "team"): 1,
+        ("keyword", "privacy"): 1,
+    }
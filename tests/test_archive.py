@@ -0,0 +1,91 @@
+import sys
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+# Ensure project root on path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.database.models import TextAnalysis
+from app.database.partitions import DEFAULT_PARTITION, add_months, ensure_partitions, list_partitions, partition_name
+from app.models.schemas import TextAnalysisResponse, TextMetadata
+from app.services.storage import store_analysis
+from app.services import archive
+
+
+def test_partition_month_math():
+    assert add_months(date(2025, 11, 1), 2) == date(2026, 1, 1)
+    assert add_months(date(2025, 1, 1), -1) == date(2024, 12, 1)
+    assert partition_name(date(2025, 3, 1)) == "text_analyses_p2025_03"
+
+
+def test_jsonl_zst_round_trip_and_filters(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "ARCHIVE_DIR", str(tmp_path))
+    created = datetime(2024, 5, 3, 12, 0, tzinfo=timezone.utc)
+    rows = [
+        (1, "Cats in gardens", "Summary", "Cats", ["pets"], "positive", ["cats"], 0.5, 0.9, created, None),
+        (2, "Market report", "Summary", "Markets", ["finance"], "negative", ["market"], 0.7, 0.8, created, None),
+    ]
+    archive._write_jsonl_zst([rows], archive.archive_path(date(2024, 5, 1), "jsonl.zst"))
+
+    restored = list(archive.iter_archived_rows(datetime(2024, 5, 1), datetime(2024, 5, 31)))
+    assert [r["id"] for r in restored] == [1, 2]
+    assert restored[0]["created_at"] == created
+    assert archive.matches_history_filters(restored[0], sentiment="positive", keyword="cat")
+    assert not archive.matches_history_filters(restored[1], search="gardens")
+    assert list(archive.iter_archived_rows(datetime(2024, 6, 1))) == []
+
+
+def test_archived_page_walks_newest_months_first(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "ARCHIVE_DIR", str(tmp_path))
+    ids = iter(range(1, 100))
+    for month in (3, 4, 5):
+        rows = [
+            (next(ids), "text", "Summary", "T", [], "positive" if day % 2 else "negative", [], 0.1, 0.5,
+             datetime(2024, month, day, tzinfo=timezone.utc), None)
+            for day in range(1, 11)
+        ]
+        archive._write_jsonl_zst([rows], archive.archive_path(date(2024, month, 1), "jsonl.zst"))
+    span = (datetime(2024, 1, 1), datetime(2024, 12, 31))
+
+    read = []
+    original = archive._read_file
+    monkeypatch.setattr(archive, "_read_file", lambda path: read.append(path.name) or original(path))
+
+    page, total, exact = archive.archived_page(8, 5, *span)
+    assert [r["id"] for r in page] == [22, 21, 20, 19, 18]
+    # Only May and April were needed; March was never opened
+    assert read == ["text_analyses_2024_05.jsonl.zst", "text_analyses_2024_04.jsonl.zst"]
+    assert (total, exact) == (20, False)
+
+    page, total, exact = archive.archived_page(0, 3, *span, sentiment="positive")
+    assert [r["id"] for r in page] == [29, 27, 25]
+
+    # Later pages read March, after which counts are cached and exact
+    archive.archived_page(25, 5, *span)
+    assert archive.archived_page(0, 5, *span)[1:] == (30, True)
+
+
+def test_rows_for_missing_months_land_in_default_partition(pg_engine, pg_session):
+    result = TextAnalysisResponse(
+        summary="Summary.",
+        metadata=TextMetadata(title="T", topics=["a", "b", "c"], sentiment="neutral", keywords=[]),
+        processing_time=0.1,
+        confidence_score=0.5,
+    )
+    row = store_analysis(pg_session, "written while no 2031-02 partition existed", result)
+    row.created_at = datetime(2031, 2, 14, tzinfo=timezone.utc)
+    pg_session.commit()
+    assert pg_session.execute(text(f'SELECT count(*) FROM "{DEFAULT_PARTITION}"')).scalar() == 1
+
+    created = ensure_partitions(pg_engine, months_ahead=0)
+    assert partition_name(date(2031, 2, 1)) in created
+    with pg_engine.connect() as conn:
+        assert conn.execute(text(f'SELECT count(*) FROM "{DEFAULT_PARTITION}"')).scalar() == 0
+        assert conn.execute(text('SELECT count(*) FROM "text_analyses_p2031_02"')).scalar() == 1
+        assert DEFAULT_PARTITION not in [name for name, _ in list_partitions(conn)]
+    assert pg_session.query(TextAnalysis).count() == 1
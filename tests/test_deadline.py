@@ -0,0 +1,67 @@
+import sys
+import asyncio
+from pathlib import Path
+
+# Ensure project root on path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import pytest
+
+from app.core.config import settings
+from app.lib.llm_client import LLMClient
+from app.utils.deadline import run_with_deadline, resolve_timeout, DeadlineExceeded, ClientDisconnected
+
+
+class DisconnectingRequest:
+    async def is_disconnected(self) -> bool:
+        return True
+
+
+@pytest.mark.asyncio
+async def test_deadline_cancels_work():
+    cancelled = asyncio.Event()
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(DeadlineExceeded):
+        await run_with_deadline(slow(), timeout=0.05)
+    assert cancelled.is_set()
+
+
+@pytest.mark.asyncio
+async def test_disconnect_cancels_work():
+    with pytest.raises(ClientDisconnected):
+        await run_with_deadline(asyncio.sleep(10), timeout=5, request=DisconnectingRequest(), poll_interval=0.01)
+
+
+def test_resolve_timeout_clamps_header():
+    assert resolve_timeout(None, 60, 120) == 60
+    assert resolve_timeout(5, 60, 120) == 5
+    assert resolve_timeout(500, 60, 120) == 120
+
+
+@pytest.mark.asyncio
+async def test_hedged_call_takes_fastest_attempt(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_HEDGE_ENABLED", True)
+    monkeypatch.setattr(settings, "LLM_HEDGE_BUDGET", 1.0)
+    monkeypatch.setattr(settings, "LLM_HEDGE_MIN_DELAY", 0.01)
+    monkeypatch.setattr(settings, "LLM_HEDGE_MIN_SAMPLES", 1)
+
+    client = LLMClient()
+    client._latencies.extend([0.01] * 10)
+    delays = iter([5.0, 0.0])
+
+    async def fake_complete(prompt: str, text_length: int = 0) -> str:
+        await asyncio.sleep(next(delays))
+        return "ok"
+
+    monkeypatch.setattr(client, "_routed_complete", fake_complete)
+    assert await asyncio.wait_for(client._hedged_complete("p"), timeout=1) == "ok"
+    assert client._hedges == 1
@@ -0,0 +1,23 @@
+import sys
+from pathlib import Path
+
+# Ensure project root on path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.services.documents import document_store, hash_text
+
+
+def test_hash_is_stable_content_address():
+    assert hash_text("same text") == hash_text("same text")
+    assert hash_text("same text") != hash_text("other text")
+    assert len(hash_text("x")) == 64
+
+
+def test_compress_round_trip():
+    text = "Cats and dogs play in gardens. " * 200
+    content, dict_id = document_store.compress(text)
+    assert dict_id is None
+    assert len(content) < len(text) // 10
+    assert document_store.decompress(content, dict_id) == text
@@ -0,0 +1,39 @@
+import sys
+from pathlib import Path
+
+# Ensure project root on path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import numpy as np
+
+from app.lib.embeddings import HashingEncoder
+from app.services.embeddings import VectorIndex
+
+
+def test_hashing_encoder_is_normalized_and_similarity_aware():
+    encoder = HashingEncoder(256)
+    vectors = encoder.encode_sync([
+        "The cat sat on the mat in the garden",
+        "A cat sat on a mat in a garden",
+        "Quarterly revenue growth beat market expectations",
+        "",
+    ])
+    assert vectors.shape == (4, 256)
+    assert np.allclose(np.linalg.norm(vectors[:3], axis=1), 1.0, atol=1e-5)
+    assert vectors[0] @ vectors[1] > vectors[0] @ vectors[2]
+
+
+def test_vector_index_append_and_search(tmp_path):
+    encoder = HashingEncoder(128)
+    index = VectorIndex(str(tmp_path / "emb"))
+    texts = ["cats and dogs", "stock market report", "dogs chasing cats"]
+    keys = [f"{i:064d}" for i in range(3)]
+    index.append(keys[:2], encoder.encode_sync(texts[:2]))
+    index.append(keys[1:], encoder.encode_sync(texts[1:]))
+    assert len(index) == 3
+
+    hits = index.search(encoder.encode_sync(["cats and dogs"])[0], 2)
+    assert hits[0][0] == keys[0]
+    assert hits[1][0] == keys[2]
@@ -0,0 +1,71 @@
+import csv
+import io
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Ensure project root on path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import orjson
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.database.models import TextAnalysis
+from app.services import export
+from app.services.history import filter_history
+
+CREATED = datetime(2025, 3, 1, 9, 30, tzinfo=timezone.utc)
+
+
+def make_batches(n_batches=3, size=4):
+    columns = export.export_columns(False)
+    batches = []
+    for b in range(n_batches):
+        batches.append([
+            (b * size + i, "Summary", f"Title {i}", ["ai", "work", ""], "neutral", ["team"], 0.4, 0.8, CREATED, None)
+            for i in range(size)
+        ])
+    return columns, batches
+
+
+def test_jsonl_and_csv_stream_one_chunk_per_batch():
+    columns, batches = make_batches()
+
+    chunks = list(export.write_jsonl(iter(batches), columns))
+    assert len(chunks) == 3
+    rows = [orjson.loads(line) for line in b"".join(chunks).splitlines()]
+    assert [r["id"] for r in rows] == list(range(12))
+    assert rows[0]["topics"] == ["ai", "work", ""] and "original_text" not in rows[0]
+
+    chunks = list(export.write_csv(iter(batches), columns))
+    assert len(chunks) == 3
+    parsed = list(csv.DictReader(io.StringIO(b"".join(chunks).decode("utf-8"))))
+    assert len(parsed) == 12
+    assert orjson.loads(parsed[0]["keywords"]) == ["team"]
+    assert parsed[0]["created_at"] == CREATED.isoformat()
+
+    # Empty export still has a header
+    assert b"".join(export.write_csv(iter([]), columns)).decode().strip() == ",".join(columns)
+
+
+def test_parquet_stream_round_trip():
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    columns, batches = make_batches()
+    data = b"".join(export.write_parquet(iter(batches), columns))
+    table = pq.read_table(pa.BufferReader(data))
+    assert table.num_rows == 12
+    assert pq.ParquetFile(pa.BufferReader(data)).num_row_groups == 3
+
+
+def test_export_query_uses_history_filters():
+    query = filter_history(Session().query(TextAnalysis.id), sentiment="Positive", keyword="ai", start=CREATED)
+    sql = str(query.statement.compile(dialect=postgresql.dialect()))
+    assert "text_analyses.sentiment = " in sql
+    assert "keywords::text ILIKE" in sql
+    assert "text_analyses.created_at >= " in sql
@@ -0,0 +1,53 @@
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Ensure project root on path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.utils.http_cache import ResponseCache, make_etag, conditional_response
+
+
+def make_app(cache: ResponseCache) -> FastAPI:
+    app = FastAPI()
+    modified = datetime(2025, 11, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+    @app.get("/items")
+    async def items(request: Request):
+        entry = cache.get("items") or cache.set("items", b'{"items":[]}', make_etag("items", 1), modified)
+        return conditional_response(request, entry)
+
+    return app
+
+
+def test_etag_and_last_modified_revalidation():
+    cache = ResponseCache(ttl=60, max_entries=10)
+    client = TestClient(make_app(cache))
+
+    first = client.get("/items")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert first.headers["last-modified"] == "Sat, 01 Nov 2025 12:00:00 GMT"
+
+    assert client.get("/items", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/items", headers={"If-None-Match": 'W/"stale"'}).status_code == 200
+    assert client.get("/items", headers={"If-Modified-Since": first.headers["last-modified"]}).status_code == 304
+    assert cache.hits >= 3
+
+
+def test_cache_ttl_and_invalidation():
+    cache = ResponseCache(ttl=60, max_entries=2)
+    cache.set("a", b"1", make_etag("a"), None)
+    cache.set("b", b"2", make_etag("b"), None)
+    cache.set("c", b"3", make_etag("c"), None)
+    assert cache.get("a") is None  # evicted (LRU)
+    assert cache.get("c").body == b"3"
+
+    cache.invalidate()
+    assert cache.get("c") is None
+    assert ResponseCache(ttl=0, max_entries=2).set("x", b"", make_etag("x"), None) is not None
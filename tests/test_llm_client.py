@@ -0,0 +1,17 @@
+import sys
+from pathlib import Path
+
+# Ensure project root on path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.lib.llm_client import llm_client
+
+
+def test_parse_json_variants():
+    raw = '{"title": "T", "topics": ["a", "b", "c"]}'
+    assert llm_client._parse_json(raw)["title"] == "T"
+    assert llm_client._parse_json(f"```json\n{raw}\n```")["title"] == "T"
+    assert llm_client._parse_json(f"Sure! {raw} Anything else?")["title"] == "T"
+    assert llm_client._parse_json("no json here") == {}
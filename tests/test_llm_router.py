@@ -0,0 +1,53 @@
+import sys
+import asyncio
+from pathlib import Path
+
+# Ensure project root on path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import pytest
+
+from app.lib.llm_client import LLMClient
+from app.lib.llm_router import LLMProvider, ProviderPool
+
+
+def make_provider(name: str, latency: float, cost: float = 1.0) -> LLMProvider:
+    p = LLMProvider(name=name, model=f"{name}-model", api_key="test", cost=cost)
+    p.record_success(latency)
+    return p
+
+
+def test_routes_by_latency_and_pins_cheap_model_for_short_inputs():
+    fast = make_provider("fast", 0.2, cost=5.0)
+    cheap = make_provider("cheap", 1.0, cost=0.5)
+    pool = ProviderPool([cheap, fast])
+
+    assert pool.candidates(5000)[0] is fast
+    assert pool.candidates(100)[0] is cheap
+
+
+def test_failures_push_provider_into_cooldown():
+    p = make_provider("flaky", 0.1)
+    for _ in range(3):
+        p.record_failure()
+    assert not p.available
+    assert p.stats()["failures"] == 3
+
+
+@pytest.mark.asyncio
+async def test_fails_over_to_next_provider(monkeypatch):
+    bad = make_provider("bad", 0.1)
+    good = make_provider("good", 0.5)
+    client = LLMClient()
+    client.pool = ProviderPool([bad, good])
+
+    async def fake_complete(prompt: str, provider: LLMProvider) -> str:
+        if provider is bad:
+            raise RuntimeError("upstream 503")
+        return provider.name
+
+    monkeypatch.setattr(client, "_complete", fake_complete)
+    assert await client._routed_complete("p", 5000) == "good"
+    assert bad.failures == 1 and good.requests == 2
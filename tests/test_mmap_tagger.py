@@ -0,0 +1,57 @@
+import random
+import sys
+from pathlib import Path
+
+# Ensure project root on path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from nltk.tag.perceptron import PerceptronTagger
+
+from app.lib.mmap_tagger import MmapPerceptronTagger, export_tagger
+
+VOCAB = ["cats", "dogs", "garden", "run", "quickly", "the", "a", "1999", "42", "well-known", "Über", "see"]
+
+
+def make_tagger(seed: int = 0) -> PerceptronTagger:
+    """Small random model with the same structure as the pickled NLTK one"""
+    rng = random.Random(seed)
+    tagger = PerceptronTagger(load=False)
+    classes = ["DT", "JJ", "NN", "NNS", "RB", "VB", "CD"]
+    tagger.classes = set(classes)
+    tagger.model.classes = tagger.classes
+    tagger.tagdict = {"the": "DT", "a": "DT"}
+
+    weights = {}
+    for i, word in enumerate(VOCAB):
+        tokens = [word] + VOCAB[i:i + 3]
+        context = tagger.START + [tagger.normalize(w) for w in tokens] + tagger.END
+        for prev in classes + tagger.START:
+            for feat in tagger._get_features(0, word, context, prev, rng.choice(classes + tagger.START)):
+                if rng.random() < 0.7:
+                    weights.setdefault(feat, {})
+                    for label in rng.sample(classes, rng.randint(1, 4)):
+                        # Coarse values so ties (broken by label) actually occur
+                        weights[feat][label] = rng.choice([-1.5, -0.5, 0.25, 0.5, 1.0])
+    tagger.model.weights = weights
+    return tagger
+
+
+def test_mmap_tagger_matches_perceptron(tmp_path):
+    tagger = make_tagger()
+    export_tagger(tagger, str(tmp_path))
+    mapped = MmapPerceptronTagger(str(tmp_path))
+
+    rng = random.Random(1)
+    for _ in range(200):
+        tokens = [rng.choice(VOCAB + ["unknown", "zebra"]) for _ in range(rng.randint(1, 12))]
+        assert mapped.tag(tokens) == tagger.tag(tokens)
+
+
+def test_mmap_tagger_load_or_export_reuses_files(tmp_path):
+    export_tagger(make_tagger(), str(tmp_path))
+    before = (tmp_path / "features.npy").stat().st_mtime_ns
+    mapped = MmapPerceptronTagger.load_or_export(str(tmp_path))
+    assert (tmp_path / "features.npy").stat().st_mtime_ns == before
+    assert mapped.tag(["the", "cats"])[0] == ("the", "DT")
@@ -0,0 +1,87 @@
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Ensure project root on path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import pytest
+
+from app.lib.profiling import LoopMonitor, SamplingProfiler, SlowRequestLog, current_trace, stage
+from app.models.schemas import LLMAnalysisResponse, TextAnalysisRequest
+from app.services.text_analyzer import text_analyzer_service
+
+
+def busy_loop(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_sampling_profiler_returns_collapsed_stacks():
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_loop, args=(stop,), name="busy")
+    worker.start()
+    try:
+        text = SamplingProfiler.format(SamplingProfiler().run(0.2, 0.005))
+    finally:
+        stop.set()
+        worker.join()
+
+    lines = [line for line in text.splitlines() if line.startswith("busy;")]
+    assert lines
+    stack, count = lines[0].rsplit(" ", 1)
+    assert int(count) > 0
+    assert "busy_loop (tests/test_profiling.py:" in stack
+
+
+def block_the_loop() -> None:
+    time.sleep(0.15)
+
+
+@pytest.mark.asyncio
+async def test_loop_monitor_records_blocking_stack():
+    monitor = LoopMonitor()
+    monitor.start(50)
+    try:
+        await asyncio.sleep(0.05)
+        block_the_loop()
+        await asyncio.sleep(0.05)
+    finally:
+        monitor.stop()
+
+    [event] = monitor.events
+    assert "block_the_loop" in event["stack"]
+    assert event["blocked_ms"] >= 50
+
+
+class SlowLLM:
+    async def analyze_text_comprehensive(self, text: str) -> LLMAnalysisResponse:
+        await asyncio.sleep(0.02)
+        return LLMAnalysisResponse(summary="Summary.", title="T", topics=["a", "b", "c"], sentiment="positive")
+
+
+@pytest.mark.asyncio
+async def test_slow_request_breakdown(monkeypatch):
+    monkeypatch.setattr(text_analyzer_service, "llm_client", SlowLLM())
+    request = TextAnalysisRequest(text="Teams adopt new tools quickly.", include_keywords=True)
+
+    log = SlowRequestLog(threshold_ms=0)
+    with log.trace("analyze") as trace:
+        assert trace is None and current_trace.get() is None
+        await text_analyzer_service.analyze_text(request)
+    assert not log.entries
+
+    log.threshold_ms = 10
+    with log.trace("analyze"):
+        await text_analyzer_service.analyze_text(request)
+        with stage("db_commit"):
+            pass
+    [entry] = log.entries
+    assert entry["total_ms"] >= 10
+    assert {"keywords", "validation", "confidence", "db_commit", "other"} <= set(entry["stages_ms"])
+    # The LLM wait is not a stage here, so it lands in "other"
+    assert entry["stages_ms"]["other"] >= 10
@@ -0,0 +1,79 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Ensure project root on path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import httpx
+import pytest
+from openai import BadRequestError
+
+from app.core.config import settings
+from app.lib.llm_client import LLMClient
+from app.lib.llm_router import LLMProvider
+from app.prompts.prompts import COMPREHENSIVE_ANALYSIS_PROMPT, TEMPLATES
+from app.prompts.registry import PromptRegistry
+
+
+def test_static_instructions_prefix_and_variant_selection():
+    registry = PromptRegistry(TEMPLATES)
+    long_text = "word " * 1000
+
+    full = registry.select("comprehensive", len(long_text), "json_object")
+    compact = registry.select("comprehensive", 200, "json_object")
+    schema = registry.select("comprehensive", len(long_text), "json_schema")
+    assert (full.variant, compact.variant, schema.variant) == ("full", "compact", "schema")
+    assert len(compact.system) < len(full.system)
+
+    # Instructions are identical across inputs; the text is the whole user message
+    a, b = full.render("first text"), full.render("second text")
+    assert a[0] == b[0]
+    assert a[1]["content"] == "first text"
+
+
+def test_pinned_version_reproduces_legacy_prompt(monkeypatch):
+    registry = PromptRegistry(TEMPLATES)
+    monkeypatch.setattr(settings, "PROMPT_VERSIONS", {"comprehensive": 1})
+    template = registry.select("comprehensive", 100, "json_object")
+    assert template.id == "comprehensive.full.v1"
+    assert template.render("hello")[1]["content"] == COMPREHENSIVE_ANALYSIS_PROMPT.format(text="hello")
+
+
+def test_usage_recorded_per_template():
+    registry = PromptRegistry(TEMPLATES)
+    usage = SimpleNamespace(prompt_tokens=100, completion_tokens=20, prompt_tokens_details=SimpleNamespace(cached_tokens=50))
+    registry.record_usage("comprehensive.full.v2", usage)
+    registry.record_usage("comprehensive.full.v2", usage)
+    [entry] = registry.stats()
+    assert entry["calls"] == 2 and entry["prompt_tokens"] == 200 and entry["cache_hit_ratio"] == 0.5
+
+
+class FakeCompletions:
+    def __init__(self) -> None:
+        self.calls = []
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        if kwargs.get("response_format", {}).get("type") == "json_schema":
+            request = httpx.Request("POST", "http://llm.test/v1/chat/completions")
+            raise BadRequestError("json_schema not supported", response=httpx.Response(400, request=request), body=None)
+        message = SimpleNamespace(content='{"title": "T"}')
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+@pytest.mark.asyncio
+async def test_rejected_output_mode_is_not_retried():
+    provider = LLMProvider(name="compat", model="m", api_key="test", base_url="http://llm.test/v1", output_mode="json_schema")
+    completions = FakeCompletions()
+    provider.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    client = LLMClient()
+
+    assert await client._complete("some text to analyze", provider) == '{"title": "T"}'
+    assert await client._complete("some text to analyze", provider) == '{"title": "T"}'
+    formats = [c.get("response_format", {}).get("type") for c in completions.calls]
+    assert formats == ["json_schema", "json_object", "json_object"]
+    assert "prompt_cache_key" not in completions.calls[-1]
+    assert provider.output_modes() == ["json_object", "text"]
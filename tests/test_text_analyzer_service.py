@@ -11,7 +11,7 @@ if str(ROOT) not in sys.path:
 import pytest
 
 from app.services.text_analyzer import text_analyzer_service
-from app.models.schemas import TextAnalysisRequest, LLMAnalysisResponse
+from app.models.schemas import TextAnalysisRequest, TextAnalysisResponse, LLMAnalysisResponse
 
 
 class DummyLLM:
@@ -46,3 +46,22 @@ async def test_analyze_text_with_mock_llm(monkeypatch):
     assert len(resp.metadata.topics) == 3
     assert 0.0 <= resp.processing_time <= 10.0
     assert 0.0 <= resp.confidence_score <= 1.0
+
+
+def test_assemble_batch_matches_per_item_path():
+    texts = ["short text here", "x" * 900, "y" * 2500]
+    requests = [TextAnalysisRequest(text=t) for t in texts]
+    analyses = [
+        LLMAnalysisResponse(summary="Summary.", title="T", topics=["a", "b", "c"], sentiment="positive"),
+        LLMAnalysisResponse(summary="", title=None, topics=["a", "", ""], sentiment="neutral"),
+        LLMAnalysisResponse(summary="Summary.", title="T", topics=["a", "b", "c"], sentiment="negative"),
+    ]
+    keywords = [["cats", "dogs"], [], ["market"]]
+
+    responses = text_analyzer_service.assemble_batch(requests, analyses, keywords, [0.1, 0.2, 0.3])
+
+    for text, analysis, kws, resp in zip(texts, analyses, keywords, responses):
+        expected = text_analyzer_service._compute_confidence(text, analysis.summary, resp.metadata)
+        assert resp.confidence_score == expected
+        assert resp.metadata.keywords == kws
+        assert TextAnalysisResponse.model_validate(resp.model_dump()) == resp